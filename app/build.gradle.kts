@@ -130,6 +130,7 @@ chaquopy {
             install("requests")
             install("urllib3")
             install("ytmusicapi")
+            install("numpy")  // For ML feature math in music_ml.py
         }
     }
 }
@@ -64,6 +64,7 @@ class ChaquopyAudioDownloader private constructor(context: Context) {
                 val success = result.optBoolean("success", false)
                 val message = result.optString("message", "Unknown error")
                 val filePath = result.optString("file_path", "")
+                val fileSize = result.optLong("file_size", 0L)
                 // val title = result.optString("title", "Unknown")
                 // val artist = result.optString("artist", "Unknown")
                 // val duration = result.optInt("duration", 0)
@@ -74,6 +75,7 @@ class ChaquopyAudioDownloader private constructor(context: Context) {
                 Log.d(TAG, "🎵 Download result - Success: $success")
                 Log.d(TAG, "🎵 Download result - Message: $message")
                 Log.d(TAG, "🎵 Download result - File path: $filePath")
+                Log.d(TAG, "🎵 Download result - File size: $fileSize bytes")
                 Log.d(TAG, "🎵 Download result - Format: $format")
                 Log.d(TAG, "🎵 Download result - FFmpeg available: $ffmpegAvailable")
 
@@ -59,7 +59,7 @@ class ChaquopyMusicAnalyzer private constructor(context: Context) {
         return withContext(Dispatchers.IO) {
             try {
                 val featuresJson = JSONArray(songFeatures.toVector().toList()).toString()
-                val resultJson = pythonModule.callAttr("get_recommendation", featuresJson, modelDir)
+                val resultJson = pythonModule.callAttr("get_recommendation", featuresJson, modelDir, INCLUDE_CLUSTER)
                 val result = JSONObject(resultJson.toString())
 
                 RecommendationResult(
@@ -114,6 +114,9 @@ class ChaquopyMusicAnalyzer private constructor(context: Context) {
     companion object {
         private const val TAG = "ChaquopyMusicAnalyzer"
 
+        // RecommendationResult has no cluster field, so skip the cluster lookup in Python
+        private const val INCLUDE_CLUSTER = false
+
         @Volatile
         private var INSTANCE: ChaquopyMusicAnalyzer? = null
 
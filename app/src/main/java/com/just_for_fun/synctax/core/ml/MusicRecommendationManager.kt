@@ -318,10 +318,12 @@ class MusicRecommendationManager(private val context: Context) {
                     // Log if needed - for now, silently continue
                 }
 
-                // Delete persisted model files
-                val modelFile = File(context.filesDir, "ml_model.json")
-                if (modelFile.exists()) {
-                    modelFile.delete()
+                // Delete persisted model files (current .npz and legacy .json)
+                listOf("ml_model.npz", "ml_model.json").forEach { name ->
+                    val modelFile = File(context.filesDir, name)
+                    if (modelFile.exists()) {
+                        modelFile.delete()
+                    }
                 }
             } catch (e: Exception) {
                 e.printStackTrace()
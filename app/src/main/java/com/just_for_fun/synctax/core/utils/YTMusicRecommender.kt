@@ -27,7 +27,8 @@ object YTMusicRecommender {
     
     /**
      * Initialize the Python ytmusicapi module
-     * Call this once during app startup
+     * Call this once during app startup: it builds the YTMusic client on the IO
+     * dispatcher, so the first search doesn't wait for its setup
      */
     fun initialize() {
         if (isInitialized) {
@@ -8,6 +8,8 @@ import json
 import subprocess
 import shutil
 
+import fast_json
+
 def convert_and_embed_metadata(
     input_path,
     output_dir,
@@ -38,7 +40,7 @@ def convert_and_embed_metadata(
         from yt_dlp.postprocessor.ffmpeg import FFmpegPostProcessor
         
         if not os.path.exists(input_path):
-            return json.dumps({
+            return fast_json.dumps({
                 "success": False,
                 "message": f"Input file not found: {input_path}",
                 "output_path": ""
@@ -103,7 +105,7 @@ def convert_and_embed_metadata(
                 result = subprocess.run(cmd, capture_output=True, timeout=120)
                 if result.returncode == 0 and os.path.exists(output_path):
                     print(f"✅ converter: FFmpeg conversion successful", file=sys.stderr)
-                    return json.dumps({
+                    return fast_json.dumps({
                         "success": True,
                         "message": "Converted and embedded with FFmpeg",
                         "output_path": output_path
@@ -130,13 +132,13 @@ def convert_and_embed_metadata(
             )
             
             if result.get('success'):
-                return json.dumps({
+                return fast_json.dumps({
                     "success": True,
                     "message": "Metadata embedded with Mutagen (no conversion)",
                     "output_path": input_path
                 })
             else:
-                return json.dumps({
+                return fast_json.dumps({
                     "success": False,
                     "message": f"Mutagen failed: {result.get('message')}",
                     "output_path": input_path
@@ -144,7 +146,7 @@ def convert_and_embed_metadata(
                 
         except Exception as e:
             print(f"⚠️ converter: Mutagen fallback failed: {e}", file=sys.stderr)
-            return json.dumps({
+            return fast_json.dumps({
                 "success": False,
                 "message": f"Both FFmpeg and Mutagen failed: {e}",
                 "output_path": input_path
@@ -154,7 +156,7 @@ def convert_and_embed_metadata(
         print(f"❌ converter: Error: {e}", file=sys.stderr)
         import traceback
         traceback.print_exc()
-        return json.dumps({
+        return fast_json.dumps({
             "success": False,
             "message": f"Error: {str(e)}",
             "output_path": ""
@@ -190,10 +192,10 @@ def get_ffmpeg_info():
             except:
                 pass
         
-        return json.dumps(info)
+        return fast_json.dumps(info)
         
     except Exception as e:
-        return json.dumps({
+        return fast_json.dumps({
             "available": False,
             "error": str(e)
         })
@@ -4,11 +4,21 @@ Downloads audio from YouTube and other platforms with album art embedding
 """
 import os
 import sys
-import json
 import subprocess
 import math
+import random
+import time
+from contextlib import contextmanager
 from typing import Dict, Any
 
+import fast_json
+
+# Image types yt-dlp writes for thumbnails
+_THUMB_EXTENSIONS = ('.jpg', '.webp', '.png', '.jpeg')
+
+# Suffixes of thumbnails written next to an audio file "<base><suffix>"
+_THUMB_SUFFIXES = frozenset(_THUMB_EXTENSIONS + ('.jpg.webp', '.webm.webp'))
+
 
 def map_format_id_to_selector(format_id: str) -> str:
     """
@@ -112,7 +122,66 @@ def crop_center_thumbnail(orig_thumb, out_dir, base):
 
 
 
-def download_audio(url: str, output_dir: str, prefer_mp3: bool = False, format_id: str = None, po_token_data: str = None) -> str:
+def _cover_thumbnail_url(info):
+    """
+    URL of the best JPEG/PNG thumbnail in a yt-dlp info dict (the only cover
+    formats MP4 supports), falling back to info['thumbnail']
+    """
+    # yt-dlp orders thumbnails from worst to best
+    for thumb in reversed(info.get('thumbnails') or []):
+        url = thumb.get('url') or ''
+        if url.split('?', 1)[0].lower().endswith(('.jpg', '.jpeg', '.png')):
+            return url
+    return info.get('thumbnail')
+
+
+# Path of a working ffmpeg once one has been found. Only hits are cached: a
+# miss is probed again on the next download, so FFmpeg installed while the
+# process runs is picked up.
+_ffmpeg_path = None
+
+
+def _find_ffmpeg():
+    """
+    Locate a working ffmpeg binary, probing only until one has been found.
+    Returns its path, or None if FFmpeg is not available.
+    """
+    global _ffmpeg_path
+    if _ffmpeg_path is None:
+        _ffmpeg_path = _probe_ffmpeg()
+    return _ffmpeg_path
+
+
+def _probe_ffmpeg():
+    """
+    Look for a working ffmpeg binary: the system PATH first, then the local
+    tools directory. Returns its path, or None if FFmpeg is not available.
+    """
+    # Try system PATH first
+    try:
+        result = subprocess.run(['ffmpeg', '-version'], capture_output=True, timeout=5)
+        if result.returncode == 0:
+            return 'ffmpeg'
+    except:
+        pass
+    
+    # If not in PATH, try local tools directory
+    # Get the project root directory (5 levels up from this file)
+    current_file = os.path.abspath(__file__)
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(current_file)))))
+    local_ffmpeg = os.path.join(project_root, 'tools', 'ffmpeg-8.0.1-essentials_build', 'bin', 'ffmpeg.exe')
+    if os.path.exists(local_ffmpeg):
+        try:
+            result = subprocess.run([local_ffmpeg, '-version'], capture_output=True, timeout=5)
+            if result.returncode == 0:
+                return local_ffmpeg
+        except:
+            pass
+    
+    return None
+
+
+def download_audio(url: str, output_dir: str, prefer_mp3: bool = False, format_id: str = None, po_token_data: str = None, ratelimit: int = None) -> str:
     """
     Download audio from a URL using yt-dlp with embedded album art and PO token support
     
@@ -122,17 +191,95 @@ def download_audio(url: str, output_dir: str, prefer_mp3: bool = False, format_i
         prefer_mp3: If True and FFmpeg is available, convert to MP3. Otherwise use M4A with embedded art.
         format_id: Specific format ID to download (optional)
         po_token_data: JSON string containing PO token data (optional)
+        ratelimit: Maximum download rate in bytes per second (optional)
         
     Returns:
         JSON string with download result
     """
+    return fast_json.dumps(_download_audio(url, output_dir, prefer_mp3, format_id, po_token_data, ratelimit))
+
+
+def download_audio_batch(urls, output_dir: str, prefer_mp3: bool = False, po_token_data: str = None,
+                         ratelimit: int = None, max_pause: float = 0) -> str:
+    """
+    Download several URLs in one call. Besides saving a Chaquopy call per
+    URL, the batch keeps one YoutubeDL per player client and reuses it for
+    every URL instead of building (and loading every extractor) per download
+    
+    Args:
+        urls: List of URLs, or a JSON array string of URLs
+        output_dir: Directory to save the downloaded files
+        prefer_mp3: If True and FFmpeg is available, convert to MP3
+        po_token_data: JSON string containing PO token data (optional)
+        ratelimit: Maximum download rate in bytes per second (optional)
+        max_pause: Sleep a random 0..max_pause seconds between downloads, so
+            a long batch looks less like a bot to YouTube (default 0, no pause)
+        
+    Returns:
+        JSON string with a list of download results, in the order of urls
+    """
+    if isinstance(urls, str):
+        urls = fast_json.loads(urls)
+    ydl_pool = {}
+    results = []
+    try:
+        for i, url in enumerate(urls):
+            if i and max_pause > 0:
+                time.sleep(random.uniform(0, max_pause))
+            results.append(_download_audio(url, output_dir, prefer_mp3, None, po_token_data, ratelimit,
+                                           ydl_pool=ydl_pool))
+    finally:
+        for ydl in ydl_pool.values():
+            ydl.close()
+    return fast_json.dumps(results)
+
+
+@contextmanager
+def _youtube_dl(ydl_opts, pool_key, ydl_pool):
+    """
+    YoutubeDL for one download attempt. Without a pool it is built and closed
+    here. With one, the instance stored under pool_key is reused, and the
+    pool's owner closes it; every option other than the player client and
+    FFmpeg path is fixed for the whole batch, so those two make up the key.
+    """
+    import yt_dlp
+
+    if ydl_pool is None:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            yield ydl
+        return
+
+    ydl = ydl_pool.get(pool_key)
+    if ydl is None:
+        ydl = ydl_pool[pool_key] = yt_dlp.YoutubeDL(ydl_opts)
+    yield ydl
+
+
+def _download_audio(url: str, output_dir: str, prefer_mp3: bool = False, format_id: str = None, po_token_data: str = None, ratelimit: int = None,
+                    ydl_pool: Dict[Any, Any] = None) -> Dict[str, Any]:
+    """
+    Download audio from a URL using yt-dlp with embedded album art and PO token support
+    
+    Args:
+        url: Video/audio URL to download
+        output_dir: Directory to save the downloaded file
+        prefer_mp3: If True and FFmpeg is available, convert to MP3. Otherwise use M4A with embedded art.
+        format_id: Specific format ID to download (optional)
+        po_token_data: JSON string containing PO token data (optional)
+        ratelimit: Maximum download rate in bytes per second (optional)
+        ydl_pool: Dict of YoutubeDL instances to reuse across calls, owned
+            and closed by download_audio_batch (optional)
+        
+    Returns:
+        Dict with download result
+    """
     # Parse PO token data (JSON format: {"visitor_data": "...", "android": "...", "web": "...", "ios": "..."})
     po_tokens = {}
     visitor_data = None
     
     if po_token_data:
         try:
-            token_dict = json.loads(po_token_data)
+            token_dict = fast_json.loads(po_token_data)
             visitor_data = token_dict.get('visitor_data')
             po_tokens = {
                 'android': token_dict.get('android'),
@@ -142,7 +289,7 @@ def download_audio(url: str, output_dir: str, prefer_mp3: bool = False, format_i
                 'mweb': token_dict.get('mweb')
             }
             print(f"🎵 Python: Loaded PO tokens for {len([t for t in po_tokens.values() if t])} clients", file=sys.stderr)
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             print(f"🎵 Python: Failed to parse PO token data: {e}", file=sys.stderr)
             # Fallback: treat as single token
             po_tokens = {}
@@ -154,8 +301,6 @@ def download_audio(url: str, output_dir: str, prefer_mp3: bool = False, format_i
     
     for client in clients_to_try:
         try:
-            import yt_dlp
-            
             # Ensure output directory exists
             os.makedirs(output_dir, exist_ok=True)
 
@@ -164,7 +309,7 @@ def download_audio(url: str, output_dir: str, prefer_mp3: bool = False, format_i
             pre_cleanup_count = 0
             if os.path.exists(output_dir):
                 for file in os.listdir(output_dir):
-                    if file.endswith(('.jpg', '.webp', '.png', '.jpeg')) and ('thumb' in file.lower() or 'thumbnail' in file.lower()):
+                    if file.endswith(_THUMB_EXTENSIONS) and 'thumb' in file.lower():
                         try:
                             file_path = os.path.join(output_dir, file)
                             os.remove(file_path)
@@ -176,34 +321,9 @@ def download_audio(url: str, output_dir: str, prefer_mp3: bool = False, format_i
             if pre_cleanup_count > 0:
                 print(f"🧹 Python: Pre-cleanup removed {pre_cleanup_count} existing thumbnail file(s)", file=sys.stderr)
             
-            # Check if FFmpeg is available
-            ffmpeg_available = False
-            ffmpeg_path = None
-            
-            # Try system PATH first
-            try:
-                import subprocess
-                result = subprocess.run(['ffmpeg', '-version'], capture_output=True, timeout=5)
-                ffmpeg_available = result.returncode == 0
-                if ffmpeg_available:
-                    ffmpeg_path = 'ffmpeg'
-            except:
-                pass
-            
-            # If not in PATH, try local tools directory
-            if not ffmpeg_available:
-                # Get the project root directory (5 levels up from this file)
-                current_file = os.path.abspath(__file__)
-                project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(current_file)))))
-                local_ffmpeg = os.path.join(project_root, 'tools', 'ffmpeg-8.0.1-essentials_build', 'bin', 'ffmpeg.exe')
-                if os.path.exists(local_ffmpeg):
-                    try:
-                        result = subprocess.run([local_ffmpeg, '-version'], capture_output=True, timeout=5)
-                        if result.returncode == 0:
-                            ffmpeg_available = True
-                            ffmpeg_path = local_ffmpeg
-                    except:
-                        pass
+            # Check if FFmpeg is available (probed until it is found)
+            ffmpeg_path = _find_ffmpeg()
+            ffmpeg_available = ffmpeg_path is not None
             
             # Configure yt-dlp options based on FFmpeg availability
             base_opts = {
@@ -211,11 +331,20 @@ def download_audio(url: str, output_dir: str, prefer_mp3: bool = False, format_i
                 'no_warnings': False,
                 'nocheckcertificate': True,
                 'prefer_free_formats': True,
+                # A watch URL with &list= must fetch only that one video
+                'noplaylist': True,
+                # Start with 64 KiB reads instead of 1 KiB; yt-dlp still
+                # adapts the size for slow connections
+                'buffersize': 64 * 1024,
             }
             
             if ffmpeg_available and ffmpeg_path:
                 base_opts['ffmpeg_location'] = ffmpeg_path
             
+            # Cap the transfer rate when asked, trading peak speed for fewer throttling hits
+            if ratelimit:
+                base_opts['ratelimit'] = int(ratelimit)
+            
             # Configure format selection
             if format_id:
                 format_spec = format_id
@@ -291,11 +420,11 @@ def download_audio(url: str, output_dir: str, prefer_mp3: bool = False, format_i
                 # FFmpeg NOT available - download native M4A format and add metadata via Mutagen
                 print(f"🎵 Python: FFmpeg not available, downloading native M4A format", file=sys.stderr)
                 ydl_opts['format'] = 'bestaudio[ext=m4a]/bestaudio'
-                ydl_opts['writethumbnail'] = True  # Download thumbnail separately
+                ydl_opts['writethumbnail'] = False  # Cover is fetched into memory for Mutagen
                 ydl_opts['postprocessors'] = []  # No FFmpeg postprocessors
             
             # Download the audio
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with _youtube_dl(ydl_opts, (client, ffmpeg_path), ydl_pool) as ydl:
                 info = ydl.extract_info(url, download=True)
                 
                 # Get the final filename
@@ -347,7 +476,7 @@ def download_audio(url: str, output_dir: str, prefer_mp3: bool = False, format_i
                     try:
                         from mutagen.mp4 import MP4, MP4Cover
                         
-                        if os.path.exists(filename) and actual_ext in ['m4a', 'mp4']:
+                        if actual_ext in ('m4a', 'mp4') and os.path.exists(filename):
                             audio = MP4(filename)
                             
                             # Set metadata tags for M4A
@@ -361,33 +490,22 @@ def download_audio(url: str, output_dir: str, prefer_mp3: bool = False, format_i
                             
                             print(f"🎵 Python: M4A tags set - Title: {title}, Artist: {artist}, Album: {album}", file=sys.stderr)
                             
-                            # Try to embed thumbnail
-                            thumb_base = os.path.splitext(filename)[0]
-                            thumb_extensions = ['.jpg', '.webp', '.png', '.jpeg']
-                            thumb_file = None
-                            for ext in thumb_extensions:
-                                potential_thumb = thumb_base + ext
-                                if os.path.exists(potential_thumb):
-                                    thumb_file = potential_thumb
-                                    break
-                            
-                            if thumb_file:
-                                print(f"🎵 Python: Found thumbnail: {thumb_file}", file=sys.stderr)
+                            # Fetch the cover straight into memory through yt-dlp's
+                            # own opener, instead of a sidecar thumbnail file
+                            thumb_url = _cover_thumbnail_url(info)
+                            if thumb_url:
+                                print(f"🎵 Python: Fetching thumbnail: {thumb_url}", file=sys.stderr)
                                 try:
-                                    with open(thumb_file, 'rb') as f:
-                                        thumb_data = f.read()
+                                    thumb_data = ydl.urlopen(thumb_url).read()
                                     
                                     # Determine format
-                                    if thumb_file.endswith('.png'):
+                                    if thumb_data.startswith(b'\x89PNG'):
                                         cover_format = MP4Cover.FORMAT_PNG
                                     else:
                                         cover_format = MP4Cover.FORMAT_JPEG
                                     
                                     audio['covr'] = [MP4Cover(thumb_data, imageformat=cover_format)]
                                     print(f"🎵 Python: Cover art embedded ({len(thumb_data)} bytes)", file=sys.stderr)
-                                    
-                                    # Clean up thumbnail file
-                                    os.remove(thumb_file)
                                 except Exception as e:
                                     print(f"🎵 Python: Cover embedding failed: {e}", file=sys.stderr)
                             
@@ -402,52 +520,50 @@ def download_audio(url: str, output_dir: str, prefer_mp3: bool = False, format_i
                 
                 # Clean up any leftover thumbnail files REGARDLESS of embedding success/failure
                 # This ensures no thumbnail files are left on disk
-                thumb_base = os.path.splitext(filename)[0]
+                thumb_name = os.path.basename(os.path.splitext(filename)[0])
                 cleanup_count = 0
                 cleanup_errors = 0
 
-                # Also check for thumbnails in the output directory with various patterns
-                output_dir_thumbs = []
-                if os.path.exists(output_dir):
-                    for file in os.listdir(output_dir):
-                        if file.endswith(('.jpg', '.webp', '.png', '.jpeg')) and ('thumb' in file.lower() or 'thumbnail' in file.lower()):
-                            output_dir_thumbs.append(os.path.join(output_dir, file))
+                # One directory scan finds both the thumbnails written next to the
+                # audio file and any stray thumbnail images in the output directory
+                thumbs = []
+                if os.path.isdir(output_dir):
+                    with os.scandir(output_dir) as entries:
+                        for entry in entries:
+                            name = entry.name
+                            if name.startswith(thumb_name) and name[len(thumb_name):] in _THUMB_SUFFIXES:
+                                thumbs.append((entry, "thumbnail"))
+                            elif name.endswith(_THUMB_EXTENSIONS) and 'thumb' in name.lower():
+                                thumbs.append((entry, "stray thumbnail"))
 
-                # Clean up thumbnail files with the same base name as the audio file
-                for ext in ['.jpg', '.webp', '.png', '.jpeg', '.jpg.webp', '.webm.webp']:
-                    potential_thumb = thumb_base + ext
-                    if os.path.exists(potential_thumb):
-                        try:
-                            file_size = os.path.getsize(potential_thumb)
-                            os.remove(potential_thumb)
-                            cleanup_count += 1
-                            print(f"🧹 Python: Cleaned up thumbnail: {potential_thumb} ({file_size} bytes)", file=sys.stderr)
-                        except Exception as e:
-                            cleanup_errors += 1
-                            print(f"🧹 Python: Failed to cleanup thumbnail {potential_thumb}: {e}", file=sys.stderr)
-
-                # Clean up any other thumbnail files found in output directory
-                for thumb_path in output_dir_thumbs:
+                for entry, kind in thumbs:
                     try:
-                        if os.path.exists(thumb_path):
-                            file_size = os.path.getsize(thumb_path)
-                            os.remove(thumb_path)
-                            cleanup_count += 1
-                            print(f"🧹 Python: Cleaned up stray thumbnail: {thumb_path} ({file_size} bytes)", file=sys.stderr)
+                        file_size = entry.stat().st_size
+                        os.remove(entry.path)
+                        cleanup_count += 1
+                        print(f"🧹 Python: Cleaned up {kind}: {entry.path} ({file_size} bytes)", file=sys.stderr)
                     except Exception as e:
                         cleanup_errors += 1
-                        print(f"🧹 Python: Failed to cleanup stray thumbnail {thumb_path}: {e}", file=sys.stderr)
+                        print(f"🧹 Python: Failed to cleanup {kind} {entry.path}: {e}", file=sys.stderr)
 
                 if cleanup_count > 0:
                     print(f"🧹 Python: Successfully cleaned up {cleanup_count} thumbnail file(s)", file=sys.stderr)
                 if cleanup_errors > 0:
                     print(f"⚠️ Python: {cleanup_errors} thumbnail cleanup error(s) occurred", file=sys.stderr)
                 
+                # Size of the final file, so callers needn't stat it again;
+                # yt-dlp's own estimate only if the file can't be read
+                try:
+                    file_size = os.stat(filename).st_size
+                except OSError:
+                    file_size = info.get('filesize') or info.get('filesize_approx') or 0
+                
                 result = {
                     "success": True,
                     "message": f"Download completed successfully using {client} client" + 
                               (" with embedded metadata" if (ffmpeg_available or metadata_embedded) else " (metadata not embedded)"),
                     "file_path": filename,
+                    "file_size": file_size,
                     "title": info.get('title', 'Unknown'),
                     "artist": info.get('artist') or info.get('uploader', 'Unknown'),
                     "duration": info.get('duration', 0),
@@ -458,7 +574,7 @@ def download_audio(url: str, output_dir: str, prefer_mp3: bool = False, format_i
                     "client_used": client,
                 }
                 
-                return json.dumps(result)
+                return result
                 
         except Exception as e:
             error_message = str(e)
@@ -482,11 +598,11 @@ def download_audio(url: str, output_dir: str, prefer_mp3: bool = False, format_i
             continue
     
     # If all clients failed, return error
-    return json.dumps({
+    return {
         "success": False,
         "message": f"Download failed with all clients. Last error: {last_error}",
         "file_path": "",
-    })
+    }
 
 def get_video_info(url: str, po_token_data: str = None) -> str:
     """
@@ -505,7 +621,7 @@ def get_video_info(url: str, po_token_data: str = None) -> str:
     
     if po_token_data:
         try:
-            token_dict = json.loads(po_token_data)
+            token_dict = fast_json.loads(po_token_data)
             visitor_data = token_dict.get('visitor_data')
             po_tokens = {
                 'android': token_dict.get('android'),
@@ -514,7 +630,7 @@ def get_video_info(url: str, po_token_data: str = None) -> str:
                 'tv': token_dict.get('tv'),
                 'mweb': token_dict.get('mweb')
             }
-        except json.JSONDecodeError:
+        except ValueError:
             # Fallback: treat as single token for current client
             pass
     
@@ -591,9 +707,9 @@ def get_video_info(url: str, po_token_data: str = None) -> str:
             continue
     
     if successful_client:
-        return json.dumps(video_info)
+        return fast_json.dumps(video_info)
     else:
-        return json.dumps({
+        return fast_json.dumps({
             "success": False,
             "message": f"Failed to get video info with all clients. Last error: {error_message}",
         })
\ No newline at end of file
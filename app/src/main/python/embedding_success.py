@@ -28,8 +28,13 @@ def run_cmd(cmd, desc, output_file):
     print(f"Trying → {desc}")
     result = subprocess.run(cmd, capture_output=True, text=True)
     
-    # Check if file was created and has actual content (> 1KB)
-    if result.returncode == 0 and os.path.exists(output_file) and os.path.getsize(output_file) > 1024:
+    # Check if file was created and has actual content (> 1KB), with one stat
+    try:
+        created = result.returncode == 0 and os.stat(output_file).st_size > 1024
+    except OSError:
+        created = False
+
+    if created:
         return True
     else:
         print(f"Failed: {desc}")
@@ -37,12 +42,11 @@ def run_cmd(cmd, desc, output_file):
             error_lines = result.stderr.strip().split('\n')
             print(error_lines[-3:])  # show last 3 lines of error
         
-        # Remove failed/empty file
-        if os.path.exists(output_file):
-            try:
-                os.remove(output_file)
-            except:
-                pass
+        # Remove failed/empty file (a missing one is fine)
+        try:
+            os.remove(output_file)
+        except OSError:
+            pass
         return False
 
 
@@ -293,8 +297,12 @@ def download_and_embed(url, out_dir=".", format_str=None):
             try: os.remove(f)
             except: pass
 
-    if final_file and os.path.exists(final_file):
-        size = os.path.getsize(final_file) / (1024*1024)
+    try:
+        size = os.stat(final_file).st_size / (1024*1024) if final_file else None
+    except OSError:
+        size = None
+
+    if size is not None:
         print(f"\nSUCCESS! → {final_file} ({size:.2f} MB)")
         print(f"Title  : {title}")
         print(f"Artist : {artist}")
@@ -303,8 +311,8 @@ def download_and_embed(url, out_dir=".", format_str=None):
         print("\nAll methods failed. Check your ffmpeg installation.")
 
 
-def main():
-    url = "https://www.youtube.com/watch?v=wAVEsckRmwY"
+def main(default_url="https://www.youtube.com/watch?v=wAVEsckRmwY"):
+    url = default_url
     if len(sys.argv) > 1:
         url = sys.argv[1]
 
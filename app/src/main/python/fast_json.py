@@ -0,0 +1,41 @@
+# src/main/python/fast_json.py
+"""
+JSON encode/decode helpers shared by the Python modules called from Kotlin.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Both paths accept str or bytes in loads() and return str from
+dumps(), and both serialize dataclass instances as objects, so callers
+don't need to know which backend is active.
+"""
+
+try:
+    import orjson
+
+    _DUMPS_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+    def loads(data):
+        return orjson.loads(data)
+
+    def dumps(obj) -> str:
+        return orjson.dumps(obj, option=_DUMPS_OPTIONS).decode("utf-8")
+
+    BACKEND = "orjson"
+
+except ImportError:
+    import dataclasses
+    import json
+
+    def _default(obj):
+        # orjson handles dataclasses natively; mirror that here
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            return dataclasses.asdict(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def loads(data):
+        return json.loads(data)
+
+    def dumps(obj) -> str:
+        # Compact, unescaped UTF-8 like orjson: the same bytes cross JNI either way
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+
+    BACKEND = "json"
@@ -8,11 +8,25 @@ Enhanced with algorithms from RECOMMENDATION_LOGIC_NEW.md:
 - Skip penalty calculation
 - Confidence scoring with implicit feedback
 """
-import json
+import base64
 import math
 import os
 from typing import List, Dict, Any
 
+import numpy as np
+
+import fast_json
+
+# Numba is optional: Chaquopy has no wheel for it, so on Android the NumPy
+# kernels below are used instead
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+_LN2 = math.log(2.0)
+
 
 def cosine_similarity(a: List[float], b: List[float]) -> float:
     """
@@ -37,9 +51,20 @@ def time_decay(days_since: float, half_life: float = 23.0) -> float:
     Calculate time decay factor using exponential decay.
     Formula: relevance(t) = e^(-λ * days)
     where λ = ln(2) / half_life (~0.03 for 23-day half-life)
+
+    e^(-ln(2) * days / half_life) is computed as 0.5 ** (days / half_life),
+    a single pow instead of log + divide + exp.
+    """
+    return 0.5 ** (days_since / half_life)
+
+
+def time_decay_arr(days_since: np.ndarray, half_life: float = 23.0) -> np.ndarray:
+    """
+    Vectorized time_decay for a batch of day offsets.
+    Unlike the scalar case, np.exp with a hoisted ln(2) beats np.power here.
     """
-    lambda_decay = math.log(2) / half_life
-    return math.exp(-lambda_decay * days_since)
+    days = np.asarray(days_since, dtype=np.float64)
+    return np.exp(days * (-_LN2 / half_life))
 
 
 def skip_penalty(listen_time: float, total_duration: float) -> float:
@@ -54,6 +79,17 @@ def skip_penalty(listen_time: float, total_duration: float) -> float:
     return math.exp(-completion_rate)
 
 
+def skip_penalty_arr(listen_time: np.ndarray, total_duration: np.ndarray) -> np.ndarray:
+    """
+    Vectorized skip_penalty for a batch of songs.
+    Songs with a non-positive duration get a penalty of 1.0, as in skip_penalty.
+    """
+    listen = np.asarray(listen_time, dtype=np.float64)
+    duration = np.asarray(total_duration, dtype=np.float64)
+    penalty = np.exp(-listen / np.maximum(duration, 1e-9))
+    return np.where(duration > 0, penalty, 1.0)
+
+
 def confidence_score(completion_rate: float, skip_rate: float, play_count: int,
                      alpha: float = 0.5, beta: float = 0.3, gamma: float = 0.2) -> float:
     """
@@ -68,45 +104,250 @@ def confidence_score(completion_rate: float, skip_rate: float, play_count: int,
             gamma * normalized_plays)
 
 
+# Model files. The model is saved as float32 arrays in an .npz archive;
+# ml_model.json is the older plain-list JSON format, still read if no
+# .npz exists.
+MODEL_FILE = "ml_model.npz"
+LEGACY_MODEL_FILE = "ml_model.json"
+
+
+def _pairwise_dist(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """(len(A), len(B)) matrix of Euclidean distances between rows of A and B"""
+    return np.sqrt(((A[:, None, :] - B[None, :, :]) ** 2).sum(axis=-1))
+
+
+def _to_array(values) -> np.ndarray:
+    """Convert a serialized float list to a float32 array; empty/missing -> None"""
+    if values is None or len(values) == 0:
+        return None
+    return np.asarray(values, dtype=np.float32)
+
+
+def _history_matrix(payload) -> np.ndarray:
+    """
+    Convert a decoded training payload to an (N, F) float32 matrix.
+
+    Accepted shapes:
+      [{"features": [...]}, ...]          legacy list of history items
+      {"features": [[...], [...]]}        dense row list
+      {"b64": "...", "shape": [N, F]}     base64 of little-endian float32 data
+    """
+    if isinstance(payload, dict):
+        if "b64" in payload:
+            buf = base64.b64decode(payload["b64"])
+            return np.frombuffer(buf, dtype="<f4").reshape(payload["shape"]).astype(np.float32)
+        return np.asarray(payload.get("features") or [], dtype=np.float32)
+    if not payload:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.asarray([item["features"] for item in payload], dtype=np.float32)
+
+
+def _to_list(values) -> List:
+    """Convert a model array back to a JSON-friendly list"""
+    return values.tolist() if values is not None else None
+
+
+# Per-song kernels. With only ~14 features and 5 centroids per call, NumPy's
+# per-operation dispatch dominates, so when Numba is present these compile to
+# single native loops. The NumPy versions compute the same values.
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _weighted_z_similarity(x, mean, inv_std, weights):
+        """sum_i weights[i] / (1 + |(x[i] - mean[i]) * inv_std[i]|)"""
+        total = 0.0
+        for i in range(x.shape[0]):
+            z = abs((x[i] - mean[i]) * inv_std[i])
+            total += weights[i] / (1.0 + z)
+        return total
+
+    @njit(cache=True, fastmath=True)
+    def _nearest_centroids(X, C):
+        """
+        Index of the nearest row of C for every row of X, over the features
+        both have (a song vector and the centroids may differ in width)
+        """
+        n_features = min(X.shape[1], C.shape[1])
+        labels = np.empty(X.shape[0], dtype=np.int64)
+        for i in range(X.shape[0]):
+            best = np.inf
+            best_j = 0
+            for j in range(C.shape[0]):
+                d = 0.0
+                for f in range(n_features):
+                    diff = X[i, f] - C[j, f]
+                    d += diff * diff
+                if d < best:
+                    best = d
+                    best_j = j
+            labels[i] = best_j
+        return labels
+else:
+    def _weighted_z_similarity(x, mean, inv_std, weights):
+        """sum_i weights[i] / (1 + |(x[i] - mean[i]) * inv_std[i]|)"""
+        z = np.abs((x - mean) * inv_std)
+        return float((1.0 / (1.0 + z)) @ weights)
+
+    def _nearest_centroids(X, C):
+        """
+        Index of the nearest row of C for every row of X, over the features
+        both have (a song vector and the centroids may differ in width)
+        """
+        n_features = min(X.shape[1], C.shape[1])
+        X = X[:, :n_features]
+        C = C[:, :n_features]
+        return ((X[:, None, :] - C[None, :, :]) ** 2).sum(axis=-1).argmin(axis=1)
+
+
+# Weights for the 14 song features used by RecommendationScorer
+FEATURE_WEIGHTS = [
+    0.10,  # playFrequency
+    0.18,  # avgCompletionRate - most important for engagement
+    0.12,  # skipRate - penalize skipped songs (inverted)
+    0.10,  # recencyScore
+    0.08,  # timeOfDayMatch
+    0.08,  # genreAffinity
+    0.08,  # artistAffinity
+    0.04,  # consecutivePlays
+    0.04,  # sessionContext
+    0.06,  # durationScore
+    0.05,  # albumAffinity
+    0.03,  # releaseYearScore
+    0.02,  # songPopularity
+    0.02   # tempoEnergy
+]
+
+# Number of recent recommendations kept for diversity tracking, and how
+# many of the most recent ones feed the diversity penalty
+RECENT_CAPACITY = 50
+DIVERSITY_WINDOW = 5
+
+
 class SimpleClustering:
     """Simple K-means clustering for song grouping"""
 
-    def __init__(self, n_clusters=5):
+    def __init__(self, n_clusters=5, tol=1e-6):
         self.n_clusters = n_clusters
+        self.tol = tol  # max centroid shift treated as converged
         self.centroids = []
+        self._C = None  # float32 ndarray copy of centroids used for prediction
 
     def fit(self, X: List[List[float]]):
+        """
+        K-means with Elkan's triangle-inequality pruning.
+
+        Each point keeps an upper bound u on the distance to its assigned
+        centroid and lower bounds l to every centroid. After centroids move,
+        the bounds are loosened by the shift; a point is only re-measured
+        when u exceeds both its lower bound and half the distance from its
+        centroid to every other centroid.
+        """
+        X = np.asarray(X, dtype=np.float64)
         if len(X) < self.n_clusters:
-            self.centroids = X.copy()
+            self._set_centroids(X)
             return
 
-        # Initialize centroids randomly
-        import random
-        self.centroids = random.sample(X, self.n_clusters)
+        C = self._kmeans_pp_init(X, np.random.default_rng())
+
+        # Initial full assignment
+        rows = np.arange(len(X))
+        lower = _pairwise_dist(X, C)
+        labels = lower.argmin(axis=1)
+        upper = lower[rows, labels]
 
         # Simple k-means iterations
         for _ in range(10):
-            clusters = [[] for _ in range(self.n_clusters)]
-
-            # Assign points to nearest centroid
-            for point in X:
-                distances = [self._distance(point, c) for c in self.centroids]
-                nearest = distances.index(min(distances))
-                clusters[nearest].append(point)
-
-            # Update centroids
-            for i, cluster in enumerate(clusters):
-                if cluster:
-                    self.centroids[i] = [sum(dim) / len(cluster) for dim in zip(*cluster)]
+            # Update centroids; empty clusters keep their previous centroid
+            new_C = self._update_centroids(X, labels, C)
+            shift = np.sqrt(((new_C - C) ** 2).sum(axis=1))
+            C = new_C
+
+            # Converged: no centroid moved far enough to change any assignment
+            if shift.max() <= self.tol:
+                break
+
+            # Loosen bounds by how far each centroid moved
+            upper += shift[labels]
+            lower = np.maximum(lower - shift, 0.0)
+
+            # bound[i, j]: d(x_i, c_j) can't be below this, so c_j can't win if u_i <= it
+            half_cc = 0.5 * _pairwise_dist(C, C)
+            bound = np.maximum(lower, half_cc[labels])
+            bound[rows, labels] = np.inf
+
+            candidates = np.flatnonzero(upper > bound.min(axis=1))
+            if len(candidates) == 0:
+                break
+
+            # Tighten the upper bound, then fully re-measure only the points still in doubt
+            upper[candidates] = np.sqrt(((X[candidates] - C[labels[candidates]]) ** 2).sum(axis=1))
+            lower[candidates, labels[candidates]] = upper[candidates]
+            todo = candidates[upper[candidates] > bound[candidates].min(axis=1)]
+            if len(todo) == 0:
+                break
+
+            dist = _pairwise_dist(X[todo], C)
+            new_labels = dist.argmin(axis=1)
+            lower[todo] = dist
+            upper[todo] = dist[np.arange(len(todo)), new_labels]
+            changed = (new_labels != labels[todo]).any()
+            labels[todo] = new_labels
+
+            # Stop once no assignment changes
+            if not changed:
+                break
+
+        self._set_centroids(C)
+
+    def _kmeans_pp_init(self, X: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        k-means++ seeding: first centroid uniform, each next one sampled with
+        probability proportional to its squared distance from the nearest
+        centroid chosen so far.
+        """
+        C = np.empty((self.n_clusters, X.shape[1]), dtype=X.dtype)
+        C[0] = X[rng.integers(len(X))]
+        closest_sq = ((X - C[0]) ** 2).sum(axis=1)
+
+        for j in range(1, self.n_clusters):
+            total = closest_sq.sum()
+            if total > 0:
+                cumulative = np.cumsum(closest_sq / total)
+                idx = min(int(np.searchsorted(cumulative, rng.random())), len(X) - 1)
+            else:
+                # All remaining points coincide with a centroid
+                idx = int(rng.integers(len(X)))
+            C[j] = X[idx]
+            closest_sq = np.minimum(closest_sq, ((X - C[j]) ** 2).sum(axis=1))
+
+        return C
+
+    def _update_centroids(self, X: np.ndarray, labels: np.ndarray, C: np.ndarray) -> np.ndarray:
+        """Mean of each cluster's points; empty clusters keep their centroid"""
+        sums = np.zeros_like(C)
+        np.add.at(sums, labels, X)
+        counts = np.bincount(labels, minlength=len(C))
+        non_empty = counts > 0
+        new_C = C.copy()
+        new_C[non_empty] = sums[non_empty] / counts[non_empty, None]
+        return new_C
+
+    def _set_centroids(self, C):
+        """Update centroids, keeping the list (for to_dict) and the cached array in sync"""
+        self._C = np.asarray(C, dtype=np.float32)
+        self.centroids = self._C.tolist()
 
     def predict_cluster(self, point: List[float]) -> int:
-        if not self.centroids:
+        if self._C is None or len(self._C) == 0:
             return 0
-        distances = [self._distance(point, c) for c in self.centroids]
-        return distances.index(min(distances))
+        p = np.asarray(point, dtype=np.float32)
+        return int(_nearest_centroids(p[None, :], self._C)[0])
 
-    def _distance(self, a: List[float], b: List[float]) -> float:
-        return math.sqrt(sum((x - y) ** 2 for x, y in zip(a, b)))
+    def predict_cluster_batch(self, X: np.ndarray) -> np.ndarray:
+        """Nearest centroid for every row of X, as an int array"""
+        if self._C is None or len(self._C) == 0:
+            return np.zeros(len(X), dtype=np.int64)
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        return _nearest_centroids(X, self._C)
 
     def to_dict(self):
         return {
@@ -116,7 +357,8 @@ class SimpleClustering:
 
     def from_dict(self, data):
         self.n_clusters = data.get("n_clusters", 5)
-        self.centroids = data.get("centroids", [])
+        centroids = data.get("centroids")
+        self._set_centroids(centroids if centroids is not None else [])
 
 
 class RecommendationScorer:
@@ -134,29 +376,76 @@ class RecommendationScorer:
         self.user_mean = None
         self.user_std = None
         self.user_profile_vector = None  # Average of liked songs
+        self._inv_std = None  # 1 / user_std (0 where std is 0), cached at fit/load time
+        self._profile_norm = 0.0  # ||user_profile_vector||, cached at fit/load time
+        self._has_profile = False  # user_profile_vector is set and non-empty
+        self._F = 0  # feature count of user_profile_vector
+        self._weights = np.asarray(FEATURE_WEIGHTS, dtype=np.float32)  # resized in _cache_derived
 
     def fit(self, user_history: List[List[float]]):
         """Train on user's listening history"""
-        if not user_history:
+        if len(user_history) == 0:
             return
 
-        n_features = len(user_history[0])
-
-        # Calculate mean and std for each feature
-        self.user_mean = []
-        self.user_std = []
+        A = np.asarray(user_history, dtype=np.float32)
 
-        for i in range(n_features):
-            values = [h[i] for h in user_history]
-            mean = sum(values) / len(values)
-            variance = sum((v - mean) ** 2 for v in values) / len(values)
-            std = math.sqrt(variance) if variance > 0 else 1.0
+        # Calculate mean and std for each feature in one pass per column
+        self.user_mean = A.mean(axis=0)
+        std = A.std(axis=0)
+        self.user_std = np.where(std > 0, std, 1.0).astype(np.float32)
 
-            self.user_mean.append(mean)
-            self.user_std.append(std)
-        
         # Create user profile vector (average of all history)
         self.user_profile_vector = self.user_mean.copy()
+        self._cache_derived()
+
+    def _cache_derived(self):
+        """
+        Precompute values that only change when the model changes:
+        1 / user_std so scoring multiplies instead of divides, and
+        ||user_profile_vector|| so scoring only pays for the song's norm.
+        """
+        if self.user_std is not None:
+            std = self.user_std
+            safe_std = np.where(std > 0, std, 1.0)
+            self._inv_std = np.where(std > 0, 1.0 / safe_std, 0.0).astype(np.float32)
+        else:
+            self._inv_std = None
+
+        if self.user_mean is not None:
+            self._weights = self._weights_for(len(self.user_mean))
+
+        v = self.user_profile_vector
+        self._has_profile = v is not None
+        self._F = len(v) if v is not None else 0
+        self._profile_norm = math.sqrt(float(v @ v)) if v is not None else 0.0
+
+    def _weights_for(self, n: int) -> np.ndarray:
+        """
+        Feature weights for n features: FEATURE_WEIGHTS truncated, or padded
+        by spreading any leftover weight evenly over the extra features.
+        The vector for the trained feature count is cached in self._weights.
+        """
+        if len(self._weights) == n:
+            return self._weights
+        if n <= len(FEATURE_WEIGHTS):
+            return np.asarray(FEATURE_WEIGHTS[:n], dtype=np.float32)
+        remaining_weight = 1.0 - sum(FEATURE_WEIGHTS)
+        extra_features = n - len(FEATURE_WEIGHTS)
+        return np.asarray(
+            FEATURE_WEIGHTS + [remaining_weight / extra_features] * extra_features,
+            dtype=np.float32
+        )
+
+    def _cos_vs_profile(self, x: List[float]) -> float:
+        """Cosine similarity against the user profile using the cached profile norm"""
+        if self._profile_norm == 0:
+            return 0.0
+        x = np.asarray(x, dtype=np.float32)
+        dot = float(x @ self.user_profile_vector)
+        x_norm = math.sqrt(float(x @ x))
+        if x_norm == 0:
+            return 0.0
+        return max(0.0, min(1.0, dot / (x_norm * self._profile_norm)))
 
     def score(self, song_features: List[float]) -> float:
         """
@@ -165,93 +454,112 @@ class RecommendationScorer:
         Score formula:
         score = weighted_similarity + cosine_sim_bonus - skip_penalty
         """
-        if not self.user_mean or not self.user_std:
+        if self.user_mean is None or self.user_std is None:
             return 0.5
 
-        # 1. Calculate Z-score based similarity
-        similarity_scores = []
-        for i, (feature, mean, std) in enumerate(zip(song_features, self.user_mean, self.user_std)):
-            z_score = abs((feature - mean) / std) if std > 0 else 0
-            similarity = 1.0 / (1.0 + z_score)
-            similarity_scores.append(similarity)
-
-        # 2. Weighted average with updated weights for 14 features
-        weights = [
-            0.10,  # playFrequency
-            0.18,  # avgCompletionRate - most important for engagement
-            0.12,  # skipRate - penalize skipped songs (inverted)
-            0.10,  # recencyScore
-            0.08,  # timeOfDayMatch
-            0.08,  # genreAffinity
-            0.08,  # artistAffinity
-            0.04,  # consecutivePlays
-            0.04,  # sessionContext
-            0.06,  # durationScore
-            0.05,  # albumAffinity
-            0.03,  # releaseYearScore
-            0.02,  # songPopularity
-            0.02   # tempoEnergy
-        ]
-        
-        # Pad weights if feature count doesn't match
-        if len(similarity_scores) < len(weights):
-            weights = weights[:len(similarity_scores)]
-        elif len(similarity_scores) > len(weights):
-            remaining_weight = 1.0 - sum(weights)
-            extra_features = len(similarity_scores) - len(weights)
-            weights.extend([remaining_weight / extra_features] * extra_features)
-        
-        weighted_score = sum(s * w for s, w in zip(similarity_scores, weights))
-        
+        x = np.asarray(song_features, dtype=np.float32)
+        n = min(len(x), len(self.user_mean))
+
+        # 1-2. Z-score based similarity, weighted average with per-feature weights
+        weighted_score = float(_weighted_z_similarity(
+            x[:n], self.user_mean[:n], self._inv_std[:n], self._weights_for(n)
+        ))
+
         # 3. Add cosine similarity bonus (content-based)
-        if self.user_profile_vector and len(song_features) == len(self.user_profile_vector):
-            cos_sim = cosine_similarity(song_features, self.user_profile_vector)
+        if self._has_profile and len(song_features) == self._F:
+            cos_sim = self._cos_vs_profile(x)
             weighted_score = weighted_score * 0.7 + cos_sim * 0.3
         
         # 4. Apply skip penalty if skipRate (index 2) is high
         if len(song_features) > 2:
-            skip_rate = song_features[2]
+            skip_rate = float(x[2])
             skip_penalty_factor = 1.0 - (skip_rate * 0.5)  # Max 50% penalty
             weighted_score *= skip_penalty_factor
 
         return max(0.0, min(1.0, weighted_score))
 
-    def score_with_context(self, song_features: List[float], 
-                          recent_songs: List[List[float]] = None) -> float:
+    def score_with_context(self, song_features: List[float],
+                          recent_songs: np.ndarray = None,
+                          recent_norms: np.ndarray = None) -> float:
         """
         Calculate score with diversity consideration.
         Penalizes songs too similar to recently played.
+
+        recent_songs is a (k, F) array of recent feature vectors and
+        recent_norms their precomputed L2 norms, so the penalty is a
+        single matrix-vector product instead of a loop over recents.
         """
         base_score = self.score(song_features)
-        
-        if not recent_songs:
+
+        if recent_songs is None or len(recent_songs) == 0:
             return base_score
-        
-        # Calculate diversity penalty
-        diversity_penalty = 0.0
-        for recent in recent_songs[-5:]:  # Last 5 songs
-            sim = cosine_similarity(song_features, recent)
-            diversity_penalty += sim
-        
-        # Normalize penalty
-        if recent_songs:
-            diversity_penalty /= min(len(recent_songs), 5)
-        
+
+        x = np.asarray(song_features, dtype=np.float32)
+        if recent_songs.shape[1] != x.shape[0]:
+            return base_score
+        if recent_norms is None:
+            recent_norms = np.sqrt((recent_songs * recent_songs).sum(axis=1))
+
+        # Cosine against each recent song, clamped to [0, 1] like cosine_similarity
+        x_norm = math.sqrt(float(x @ x))
+        cos = (recent_songs @ x) / (recent_norms * x_norm + 1e-12)
+        diversity_penalty = float(np.clip(cos, 0.0, 1.0).mean())
+
         # Formula: final_score = base_score * (1 - diversity_factor * penalty)
         diversity_factor = 0.3  # Max 30% diversity penalty
         return base_score * (1.0 - diversity_factor * diversity_penalty)
 
+    def score_many(self, X: np.ndarray, recent_songs: np.ndarray = None,
+                   recent_norms: np.ndarray = None) -> np.ndarray:
+        """
+        Vectorized score_with_context for a (N, F) batch of songs.
+        Returns an (N,) array of scores in [0, 1].
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if self.user_mean is None or self.user_std is None:
+            return np.full(len(X), 0.5)
+
+        F = X.shape[1]
+        n = min(F, len(self.user_mean))
+        x_norm = np.sqrt((X * X).sum(axis=1))
+
+        # 1-2. Weighted Z-score similarity
+        Z = np.abs((X[:, :n] - self.user_mean[:n]) * self._inv_std[:n])
+        scores = (1.0 / (1.0 + Z)) @ self._weights_for(n)
+
+        # 3. Cosine similarity bonus
+        if self._has_profile and F == self._F and self._profile_norm > 0:
+            denom = x_norm * self._profile_norm
+            cos = np.divide(X @ self.user_profile_vector, denom,
+                            out=np.zeros(len(X), dtype=np.float32), where=denom > 0)
+            scores = scores * 0.7 + np.clip(cos, 0.0, 1.0) * 0.3
+
+        # 4. Skip penalty
+        if F > 2:
+            scores = scores * (1.0 - X[:, 2] * 0.5)
+        scores = np.clip(scores, 0.0, 1.0)
+
+        # Diversity penalty against recent songs
+        if recent_songs is not None and len(recent_songs) > 0 and recent_songs.shape[1] == F:
+            if recent_norms is None:
+                recent_norms = np.sqrt((recent_songs * recent_songs).sum(axis=1))
+            cos = (X @ recent_songs.T) / (x_norm[:, None] * recent_norms[None, :] + 1e-12)
+            scores = scores * (1.0 - 0.3 * np.clip(cos, 0.0, 1.0).mean(axis=1))
+
+        return scores
+
     def to_dict(self):
         return {
-            "user_mean": self.user_mean,
-            "user_std": self.user_std,
-            "user_profile_vector": self.user_profile_vector
+            "user_mean": _to_list(self.user_mean),
+            "user_std": _to_list(self.user_std),
+            "user_profile_vector": _to_list(self.user_profile_vector)
         }
 
     def from_dict(self, data):
-        self.user_mean = data.get("user_mean")
-        self.user_std = data.get("user_std")
-        self.user_profile_vector = data.get("user_profile_vector")
+        self.user_mean = _to_array(data.get("user_mean"))
+        self.user_std = _to_array(data.get("user_std"))
+        self.user_profile_vector = _to_array(data.get("user_profile_vector"))
+        self._cache_derived()
 
 
 class MusicRecommendationML:
@@ -270,35 +578,37 @@ class MusicRecommendationML:
         self.clustering = SimpleClustering(n_clusters=5)
         self.is_trained = False
         self.model_dir = model_dir or "."
-        self.recent_recommendations = []  # For diversity tracking
+        # Ring buffer of recent recommendations for diversity tracking,
+        # allocated lazily once the feature count is known
+        self._recent_buf = None  # (RECENT_CAPACITY, F) float32
+        self._recent_norms = None  # (RECENT_CAPACITY,) L2 norm of each row
+        self._recent_head = 0
+        self._recent_n = 0
         self._load_model()
 
     def train(self, user_history_json: str) -> Dict[str, Any]:
         """Train models on user listening history"""
         try:
-            user_history = json.loads(user_history_json)
+            features = _history_matrix(fast_json.loads(user_history_json))
 
-            if not user_history or len(user_history) < 5:
+            if len(features) < 5:
                 return {
                     "success": False,
                     "message": "Insufficient training data (need at least 5 samples)"
                 }
 
-            # Extract features from history
-            features_list = [item["features"] for item in user_history]
-
             # Train recommendation scorer
-            self.scorer.fit(features_list)
+            self.scorer.fit(features)
 
             # Train clustering model
-            self.clustering.fit(features_list)
+            self.clustering.fit(features)
 
             self.is_trained = True
             self._save_model()
 
             return {
                 "success": True,
-                "samples_trained": len(user_history),
+                "samples_trained": len(features),
                 "message": "Training completed successfully"
             }
 
@@ -308,7 +618,7 @@ class MusicRecommendationML:
                 "message": f"Training failed: {str(e)}"
             }
 
-    def recommend(self, song_features_json: str) -> Dict[str, Any]:
+    def recommend(self, song_features_json: str, include_cluster: bool = True) -> Dict[str, Any]:
         """
         Generate recommendation score for a song.
         
@@ -317,6 +627,9 @@ class MusicRecommendationML:
         - Cosine similarity bonus
         - Skip penalty
         - Diversity consideration
+
+        The nearest-cluster lookup is skipped (and "cluster" omitted from
+        the result) when include_cluster is False.
         """
         if not self.is_trained:
             return {
@@ -328,17 +641,14 @@ class MusicRecommendationML:
             }
 
         try:
-            song_features = json.loads(song_features_json)
+            song_features = fast_json.loads(song_features_json)
 
             # Get base score with diversity consideration
+            recent, recent_norms = self._recent_window(DIVERSITY_WINDOW)
             base_score = self.scorer.score_with_context(
-                song_features, 
-                self.recent_recommendations[-10:]  # Consider last 10 recommendations
+                song_features, recent, recent_norms
             ) * 100
 
-            # Get cluster information
-            cluster_id = self.clustering.predict_cluster(song_features)
-
             # Calculate confidence using implicit feedback formula
             # Extract relevant features (playFrequency=0, avgCompletionRate=1, skipRate=2)
             play_freq = song_features[0] if len(song_features) > 0 else 0.5
@@ -355,17 +665,17 @@ class MusicRecommendationML:
             confidence = min(0.95, max(0.3, confidence))
             
             # Track this recommendation for diversity
-            self.recent_recommendations.append(song_features)
-            if len(self.recent_recommendations) > 50:
-                self.recent_recommendations.pop(0)
+            self._remember(song_features)
 
-            return {
+            result = {
                 "score": base_score,
                 "confidence": confidence,
-                "cluster": cluster_id,
                 "diversity_score": 1.0 - (skip_rate * 0.5),
                 "message": "Recommendation generated successfully"
             }
+            if include_cluster:
+                result["cluster"] = self.clustering.predict_cluster(song_features)
+            return result
 
         except Exception as e:
             return {
@@ -375,6 +685,88 @@ class MusicRecommendationML:
                 "message": f"Recommendation failed: {str(e)}"
             }
 
+    def recommend_batch(self, song_features_json: str, include_cluster: bool = True) -> Dict[str, Any]:
+        """
+        Score a batch of songs in one call.
+
+        song_features_json is a JSON 2-D list (one feature vector per song).
+        Scores use the same formula as recommend(), with the diversity
+        penalty taken against the current recent-recommendations window;
+        batch candidates are not added to that window.
+
+        Identical feature vectors (common for tracks from the same artist or
+        album) are scored once and the result is shared; cache_hit_rate is the
+        fraction of songs that reused another song's result. As in
+        recommend(), "cluster" is only computed when include_cluster is True.
+        """
+        X = np.asarray(fast_json.loads(song_features_json), dtype=np.float32)
+        if X.ndim != 2 or len(X) == 0:
+            return {"results": [], "cache_hit_rate": 0.0}
+
+        if not self.is_trained:
+            return {"results": [{
+                "score": 50.0,
+                "confidence": 0.3,
+                "cluster": -1,
+                "diversity_score": 1.0,
+                "message": "Model not trained yet"
+            } for _ in range(len(X))], "cache_hit_rate": 0.0}
+
+        # Score each distinct vector once; inverse maps every song back to its row
+        U, inverse = np.unique(X, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        recent, recent_norms = self._recent_window(DIVERSITY_WINDOW)
+        scores = self.scorer.score_many(U, recent, recent_norms) * 100
+
+        # Confidence from playFrequency=0, avgCompletionRate=1, skipRate=2
+        F = U.shape[1]
+        play_freq = U[:, 0] if F > 0 else np.full(len(U), 0.5)
+        completion = U[:, 1] if F > 1 else np.full(len(U), 0.5)
+        skip_rate = U[:, 2] if F > 2 else np.zeros(len(U))
+        play_count = np.trunc(play_freq * 100)  # Denormalize, as int() does
+        confidence = (0.5 * completion + 0.3 * (1.0 - skip_rate)
+                      + 0.2 * np.minimum(play_count / 100.0, 1.0))
+        confidence = np.clip(confidence, 0.3, 0.95)
+        diversity = 1.0 - skip_rate * 0.5
+
+        unique_results = [{
+            "score": float(scores[i]),
+            "confidence": float(confidence[i]),
+            "diversity_score": float(diversity[i]),
+            "message": "Recommendation generated successfully"
+        } for i in range(len(U))]
+        if include_cluster:
+            for result, cluster_id in zip(unique_results, self.clustering.predict_cluster_batch(U)):
+                result["cluster"] = int(cluster_id)
+
+        return {
+            "results": [unique_results[i] for i in inverse],
+            "cache_hit_rate": 1.0 - len(U) / len(X)
+        }
+
+    def _remember(self, song_features: List[float]):
+        """Write a recommended song into the recent-recommendations ring buffer"""
+        v = np.asarray(song_features, dtype=np.float32)
+        if self._recent_buf is None or self._recent_buf.shape[1] != v.shape[0]:
+            self._recent_buf = np.zeros((RECENT_CAPACITY, v.shape[0]), dtype=np.float32)
+            self._recent_norms = np.zeros(RECENT_CAPACITY, dtype=np.float32)
+            self._recent_head = 0
+            self._recent_n = 0
+
+        self._recent_buf[self._recent_head] = v
+        self._recent_norms[self._recent_head] = math.sqrt(float(v @ v))
+        self._recent_head = (self._recent_head + 1) % RECENT_CAPACITY
+        self._recent_n = min(self._recent_n + 1, RECENT_CAPACITY)
+
+    def _recent_window(self, n: int):
+        """Return the last n remembered songs and their norms, or (None, None)"""
+        if self._recent_n == 0:
+            return None, None
+        n = min(n, self._recent_n)
+        idx = (self._recent_head - n + np.arange(n)) % RECENT_CAPACITY
+        return self._recent_buf[idx], self._recent_norms[idx]
+
     def get_status(self) -> Dict[str, Any]:
         """Get current model status"""
         return {
@@ -386,23 +778,38 @@ class MusicRecommendationML:
     def _save_model(self):
         """Save model state to file"""
         try:
-            model_data = {
-                "is_trained": self.is_trained,
-                "scorer": self.scorer.to_dict(),
-                "clustering": self.clustering.to_dict()
+            state = {**self.scorer.to_dict(), **self.clustering.to_dict()}
+            arrays = {
+                key: np.asarray(value, dtype=np.float32)
+                for key, value in state.items()
+                if key != "n_clusters" and value is not None
             }
-            with open(os.path.join(self.model_dir, "ml_model.json"), "w") as f:
-                json.dump(model_data, f)
+            np.savez(
+                os.path.join(self.model_dir, MODEL_FILE),
+                is_trained=np.bool_(self.is_trained),
+                n_clusters=np.int64(state["n_clusters"]),
+                **arrays
+            )
         except Exception as e:
             print(f"Failed to save model: {e}")
 
     def _load_model(self):
         """Load model state from file"""
         try:
-            model_file = os.path.join(self.model_dir, "ml_model.json")
+            model_file = os.path.join(self.model_dir, MODEL_FILE)
             if os.path.exists(model_file):
-                with open(model_file, "r") as f:
-                    model_data = json.load(f)
+                with np.load(model_file, allow_pickle=False) as archive:
+                    state = {key: archive[key] for key in archive.files}
+                self.is_trained = bool(state.pop("is_trained", False))
+                state["n_clusters"] = int(state.get("n_clusters", 5))
+                self.scorer.from_dict(state)
+                self.clustering.from_dict(state)
+                return
+
+            legacy_file = os.path.join(self.model_dir, LEGACY_MODEL_FILE)
+            if os.path.exists(legacy_file):
+                with open(legacy_file, "r") as f:
+                    model_data = fast_json.loads(f.read())
                 self.is_trained = model_data.get("is_trained", False)
                 self.scorer.from_dict(model_data.get("scorer", {}))
                 self.clustering.from_dict(model_data.get("clustering", {}))
@@ -424,32 +831,47 @@ def train_model(user_history_json: str, model_dir=None) -> str:
     """Train the recommendation model"""
     engine = _get_engine(model_dir)
     result = engine.train(user_history_json)
-    return json.dumps(result)
+    return fast_json.dumps(result)
 
 
-def get_recommendation(song_features_json: str, model_dir=None) -> str:
+def get_recommendation(song_features_json: str, model_dir=None, include_cluster=True) -> str:
     """Get recommendation score for a song"""
     engine = _get_engine(model_dir)
-    result = engine.recommend(song_features_json)
-    return json.dumps(result)
+    result = engine.recommend(song_features_json, include_cluster)
+    return fast_json.dumps(result)
+
+
+def get_recommendations(song_features_json: str, model_dir=None, include_cluster=True) -> str:
+    """
+    Get recommendation scores for a batch of songs (JSON 2-D list).
+    Returns {"results": [...], "cache_hit_rate": float}.
+    """
+    engine = _get_engine(model_dir)
+    try:
+        result = engine.recommend_batch(song_features_json, include_cluster)
+    except Exception as e:
+        print(f"Batch recommendation failed: {e}")
+        result = {"results": [], "cache_hit_rate": 0.0}
+    return fast_json.dumps(result)
 
 
 def get_model_status(model_dir=None) -> str:
     """Get current model status"""
     engine = _get_engine(model_dir)
     result = engine.get_status()
-    return json.dumps(result)
+    return fast_json.dumps(result)
 
 
 def reset_model(model_dir=None) -> str:
     """Reset the ML engine state"""
     global _ml_engine
     if _ml_engine:
-        try:
-            model_file = os.path.join(_ml_engine.model_dir, "ml_model.json")
-            if os.path.exists(model_file):
-                os.remove(model_file)
-        except:
-            pass
+        for name in (MODEL_FILE, LEGACY_MODEL_FILE):
+            try:
+                model_file = os.path.join(_ml_engine.model_dir, name)
+                if os.path.exists(model_file):
+                    os.remove(model_file)
+            except:
+                pass
     _ml_engine = MusicRecommendationML(model_dir)
-    return json.dumps({"success": True, "message": "Model reset"})
\ No newline at end of file
+    return fast_json.dumps({"success": True, "message": "Model reset"})
\ No newline at end of file
@@ -128,37 +128,111 @@
 #         })
 
 # src/main/python/spotify_playlist_importer.py
-import json
 import re
 import requests
 import base64
+import threading
+import time
+from collections import OrderedDict
 from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import fast_json
+
+# Concurrent YouTube Music searches per import
+YT_SEARCH_WORKERS = 8
+
+# Concurrent Spotify page fetches
+SPOTIFY_PAGE_WORKERS = 4
+
+# (connect, read) timeout for requests that don't pass their own. ytmusicapi
+# posts its searches without one, so this is what bounds a hung search.
+HTTP_TIMEOUT = (5, 15)
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies HTTP_TIMEOUT to requests sent without a timeout"""
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = HTTP_TIMEOUT
+        return super().send(request, **kwargs)
+
+
+# Shared HTTP session: keep-alive + gzip so the token request, every
+# Spotify page and the YouTube Music searches reuse pooled connections
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "Accept-Encoding": "gzip",
+    "User-Agent": "Mozilla/5.0 (compatible; SyncTax/1.0)"
+})
+_SESSION.mount("https://", _TimeoutHTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=YT_SEARCH_WORKERS + SPOTIFY_PAGE_WORKERS,
+    # Retry dropped connections (e.g. a stale keep-alive socket) with a short backoff
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
 
 # Import ytmusicapi for YouTube Music search (already installed via Chaquopy)
+try:
+    from ytmusicapi.exceptions import YTMusicServerError
+except ImportError:
+    # Without ytmusicapi no search reaches the server, so nothing raises this
+    class YTMusicServerError(Exception):
+        pass
+
 try:
     from ytmusicapi import YTMusic
-    _ytmusic = YTMusic()
+    _ytmusic = YTMusic(requests_session=_SESSION)
     print("[Spotify Import] ytmusicapi initialized successfully")
 except Exception as e:
     _ytmusic = None
     print(f"[Spotify Import] Failed to initialize ytmusicapi: {e}")
 
+# Spotify Web API field projections: only request what fetch_spotify_playlist reads
+SPOTIFY_PAGE_SIZE = 100
+_TRACK_ITEM_FIELDS = "items(track(name,artists(name),duration_ms,album(name),is_local))"
+_PLAYLIST_FIELDS = f"name,description,images,tracks(next,total,{_TRACK_ITEM_FIELDS})"
+_TRACKS_PAGE_FIELDS = _TRACK_ITEM_FIELDS
+
+# Playlist URL/URI forms accepted by validate_spotify_url, as one alternation:
+# open.spotify.com/playlist/<id>, spotify.com/playlist/<id>, spotify:playlist:<id>
+_SPOTIFY_PLAYLIST_RE = re.compile(r"(?:spotify\.com/playlist/|spotify:playlist:)([a-zA-Z0-9]+)")
+
 # Spotify API credentials - passed from Kotlin at runtime
 SPOTIFY_CLIENT_ID = None
 SPOTIFY_CLIENT_SECRET = None
 
+# Client-credentials token reused until shortly before it expires
+_TOKEN_CACHE = {"token": None, "exp": 0.0}
+_TOKEN_LOCK = threading.Lock()
+_TOKEN_EXPIRY_MARGIN = 30  # seconds
+
 def set_spotify_credentials(client_id, client_secret):
     """Set Spotify API credentials from Kotlin"""
     global SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET
-    SPOTIFY_CLIENT_ID = client_id
-    SPOTIFY_CLIENT_SECRET = client_secret
+    with _TOKEN_LOCK:
+        if (client_id, client_secret) != (SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET):
+            _TOKEN_CACHE["token"] = None
+            _TOKEN_CACHE["exp"] = 0.0
+        SPOTIFY_CLIENT_ID = client_id
+        SPOTIFY_CLIENT_SECRET = client_secret
     print(f"[Spotify Import] Credentials set - ID length: {len(client_id)}, Secret length: {len(client_secret)}")
 
 def get_spotify_access_token():
-    """Get access token using client credentials flow"""
+    """Get access token using client credentials flow, reusing a cached one while valid"""
     if not SPOTIFY_CLIENT_ID or not SPOTIFY_CLIENT_SECRET:
         raise Exception("Spotify API credentials not set. Call set_spotify_credentials first.")
-    
+
+    with _TOKEN_LOCK:
+        if _TOKEN_CACHE["token"] and time.time() < _TOKEN_CACHE["exp"] - _TOKEN_EXPIRY_MARGIN:
+            return _TOKEN_CACHE["token"]
+        return _request_spotify_access_token()
+
+def _request_spotify_access_token():
+    """POST the client credentials and cache the returned token; caller holds _TOKEN_LOCK"""
     try:
         auth_url = "https://accounts.spotify.com/api/token"
         auth_data = {
@@ -168,10 +242,13 @@ def get_spotify_access_token():
             "Authorization": f"Basic {base64.b64encode(f'{SPOTIFY_CLIENT_ID}:{SPOTIFY_CLIENT_SECRET}'.encode()).decode()}",
             "Content-Type": "application/x-www-form-urlencoded"
         }
-        resp = requests.post(auth_url, data=auth_data, headers=auth_headers, timeout=10)
+        resp = _SESSION.post(auth_url, data=auth_data, headers=auth_headers, timeout=10)
         if resp.status_code == 200:
             print("[Spotify Import] Access token obtained successfully")
-            return resp.json()["access_token"]
+            token_data = fast_json.loads(resp.content)
+            _TOKEN_CACHE["token"] = token_data["access_token"]
+            _TOKEN_CACHE["exp"] = time.time() + token_data.get("expires_in", 3600)
+            return _TOKEN_CACHE["token"]
         else:
             raise Exception(f"Failed to get token: {resp.status_code} - {resp.text}")
     except Exception as e:
@@ -179,71 +256,196 @@ def get_spotify_access_token():
 
 def validate_spotify_url(url):
     """Check if URL is a valid Spotify playlist and extract ID"""
-    patterns = [
-        r"open\.spotify\.com/playlist/([a-zA-Z0-9]+)",
-        r"spotify:playlist:([a-zA-Z0-9]+)",
-        r"spotify\.com/playlist/([a-zA-Z0-9]+)"
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return {
-                "isValid": True,
-                "platform": "spotify",
-                "playlistId": match.group(1)
-            }
+    match = _SPOTIFY_PLAYLIST_RE.search(url)
+    if match:
+        return {
+            "isValid": True,
+            "platform": "spotify",
+            "playlistId": match.group(1)
+        }
     return {"isValid": False, "platform": None, "playlistId": None}
 
+# Query normalization for the search cache key: lowercase, drop "(feat. ...)"
+# and "[...]" suffixes, collapse whitespace. Only the key is normalized; the
+# search itself is sent with the original query.
+_QUERY_NOISE_RE = re.compile(r"\(feat\.[^)]*\)|\[[^\]]*\]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_query(query):
+    return _WHITESPACE_RE.sub(" ", _QUERY_NOISE_RE.sub("", query.lower())).strip()
+
+
+# Queries with no match are remembered only briefly, so a track that gets
+# uploaded later (or a transient empty response) isn't missed for good
+_MISS_TTL_SECONDS = 600
+_MISS_CACHE_MAX = 4096
+_search_misses = {}  # normalized query -> time.time() of the empty search
+
+# Matches are kept for the process lifetime, least recently used evicted first
+_SEARCH_CACHE_SIZE = 4096
+_search_hits = OrderedDict()  # normalized query -> match dict, in LRU order
+_search_hits_lock = threading.Lock()
+
+
+# Circuit breaker: after this many consecutive timeouts, connection errors or
+# HTTP error replies (YTMusicServerError) the rest of the import skips
+# YouTube Music instead of waiting out every request
+SEARCH_FAILURE_THRESHOLD = 5
+_search_failures = 0
+_search_failures_lock = threading.Lock()
+
+
+def _record_search_outcome(failed):
+    """Update the consecutive failure count after a search"""
+    global _search_failures
+    with _search_failures_lock:
+        if not failed:
+            _search_failures = 0
+            return
+        _search_failures += 1
+        if _search_failures == SEARCH_FAILURE_THRESHOLD:
+            print(f"[Spotify Import] {SEARCH_FAILURE_THRESHOLD} consecutive YouTube Music "
+                  f"network/server errors, skipping remaining searches")
+
+
+def _reset_search_breaker():
+    global _search_failures
+    with _search_failures_lock:
+        _search_failures = 0
+
+
 def search_youtube_music(query):
     """Search YouTube Music using ytmusicapi (reliable, no API keys needed)"""
-    global _ytmusic
-    
+    if _search_failures >= SEARCH_FAILURE_THRESHOLD:
+        return None
+
+    key = _normalize_query(query)
+    missed_at = _search_misses.get(key)
+    if missed_at is not None and time.time() - missed_at < _MISS_TTL_SECONDS:
+        return None
+
+    with _search_hits_lock:
+        result = _search_hits.get(key)
+        if result is not None:
+            _search_hits.move_to_end(key)
+            return result
+
     try:
-        if _ytmusic is None:
-            # Try to initialize again if it failed earlier
-            from ytmusicapi import YTMusic
-            _ytmusic = YTMusic()
-        
-        print(f"[Spotify Import] Searching YouTube Music for: {query}")
-        
-        # Search for songs specifically
-        results = _ytmusic.search(query, filter="songs", limit=5)
-        
-        if results and len(results) > 0:
-            # Get the first song result
-            song = results[0]
-            video_id = song.get("videoId")
-            
-            if video_id:
-                # Get thumbnail - try different thumbnail formats
-                thumbnails = song.get("thumbnails", [])
-                thumbnail = thumbnails[-1]["url"] if thumbnails else ""
-                
-                print(f"[Spotify Import] Found: {song.get('title', 'Unknown')} - VideoId: {video_id}")
-                
-                return {
-                    "videoId": video_id,
-                    "title": song.get("title", ""),
-                    "artist": ", ".join([a["name"] for a in song.get("artists", [])]) if song.get("artists") else "",
-                    "duration": song.get("duration_seconds", 0),
-                    "thumbnail": thumbnail,
-                }
-        
-        print(f"[Spotify Import] No results found for: {query}")
+        result = _search_youtube_music_uncached(query)
+        _record_search_outcome(failed=False)
+    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+        _record_search_outcome(failed=True)
+        print(f"[Spotify Import] YouTube search network error for '{query}': {str(e)}")
+        return None
+    except YTMusicServerError as e:
+        _record_search_outcome(failed=True)
+        print(f"[Spotify Import] YouTube search server error for '{query}': {str(e)}")
         return None
-        
     except Exception as e:
         print(f"[Spotify Import] YouTube search error for '{query}': {str(e)}")
         return None
 
+    if result is None:
+        if len(_search_misses) >= _MISS_CACHE_MAX:
+            _search_misses.clear()
+        _search_misses[key] = time.time()
+        return None
+
+    with _search_hits_lock:
+        _search_hits[key] = result
+        if len(_search_hits) > _SEARCH_CACHE_SIZE:
+            _search_hits.popitem(last=False)
+    return result
+
+
+def _search_youtube_music_uncached(query):
+    """
+    YouTube Music lookup for the first song result, or None if there is none.
+    Errors are raised to search_youtube_music, which owns the caching.
+    """
+    global _ytmusic
+
+    if _ytmusic is None:
+        # Try to initialize again if it failed earlier
+        from ytmusicapi import YTMusic
+        _ytmusic = YTMusic(requests_session=_SESSION)
+
+    print(f"[Spotify Import] Searching YouTube Music for: {query}")
+
+    # Search for songs specifically
+    results = _ytmusic.search(query, filter="songs", limit=5)
+
+    if results and len(results) > 0:
+        # Get the first song result
+        song = results[0]
+        video_id = song.get("videoId")
+
+        if video_id:
+            # Get thumbnail - try different thumbnail formats
+            thumbnails = song.get("thumbnails", [])
+            thumbnail = thumbnails[-1]["url"] if thumbnails else ""
+
+            print(f"[Spotify Import] Found: {song.get('title', 'Unknown')} - VideoId: {video_id}")
+
+            return {
+                "videoId": video_id,
+                "title": song.get("title", ""),
+                "artist": ", ".join([a["name"] for a in song.get("artists", [])]) if song.get("artists") else "",
+                "duration": song.get("duration_seconds", 0),
+                "thumbnail": thumbnail,
+            }
+
+    print(f"[Spotify Import] No results found for: {query}")
+    return None
+
+
+def _fetch_tracks_page(tracks_url, headers, offset):
+    """Fetch one page of playlist items; None if the request fails"""
+    params = {
+        "fields": _TRACKS_PAGE_FIELDS,
+        "limit": SPOTIFY_PAGE_SIZE,
+        "offset": offset
+    }
+    resp = _SESSION.get(tracks_url, headers=headers, params=params, timeout=20)
+    if resp.status_code != 200:
+        return None
+    return fast_json.loads(resp.content)["items"]
+
+
+def _iter_playlist_items(tracks_url, headers, first_page):
+    """
+    Yield playlist track items page by page, starting with the page embedded
+    in the playlist response. The remaining page offsets are known from
+    "total", so those pages are fetched concurrently and yielded in order.
+    """
+    yield from first_page["items"]
+
+    if first_page["next"] is None:
+        return
+
+    offsets = range(len(first_page["items"]), first_page["total"], SPOTIFY_PAGE_SIZE)
+    print(f"[Spotify Import] Fetching {len(offsets)} more pages...")
+    executor = ThreadPoolExecutor(max_workers=SPOTIFY_PAGE_WORKERS)
+    try:
+        futures = [executor.submit(_fetch_tracks_page, tracks_url, headers, offset) for offset in offsets]
+        for future in futures:
+            items = future.result()
+            if not items:
+                return
+            yield from items
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
 
 def fetch_spotify_playlist(url):
     """Main function called from Kotlin"""
     try:
         print(f"[Spotify Import] Starting import for URL: {url}")
+        _reset_search_breaker()
         validation = validate_spotify_url(url)
         if not validation["isValid"]:
-            return json.dumps({"success": False, "error": "Invalid Spotify URL"})
+            return fast_json.dumps({"success": False, "error": "Invalid Spotify URL"})
 
         playlist_id = validation["playlistId"]
         print(f"[Spotify Import] Playlist ID: {playlist_id}")
@@ -253,88 +455,89 @@ def fetch_spotify_playlist(url):
 
         # Step 1: Get playlist metadata + tracks
         api_url = f"https://api.spotify.com/v1/playlists/{playlist_id}"
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "User-Agent": "Mozilla/5.0 (compatible; SyncTax/1.0)"
-        }
+        headers = {"Authorization": f"Bearer {access_token}"}
 
         print(f"[Spotify Import] Fetching playlist from Spotify API...")
-        resp = requests.get(api_url, headers=headers, timeout=20)
+        resp = _SESSION.get(api_url, headers=headers, params={"fields": _PLAYLIST_FIELDS}, timeout=20)
         if resp.status_code != 200:
             error_msg = f"Failed to fetch playlist: HTTP {resp.status_code} - {resp.text}"
             print(f"[Spotify Import] Error: {error_msg}")
-            return json.dumps({"success": False, "error": error_msg})
+            return fast_json.dumps({"success": False, "error": error_msg})
 
-        data = resp.json()
+        data = fast_json.loads(resp.content)
 
         playlist_name = data["name"]
         description = data.get("description", "")
-        thumbnail = data["images"][0]["url"] if data["images"] else ""
+        thumbnail = data["images"][0]["url"] if data.get("images") else ""
         print(f"[Spotify Import] Playlist name: {playlist_name}")
 
         tracks = []
-        items = data["tracks"]["items"]
-        print(f"[Spotify Import] Initial items count: {len(items)}")
-
-        # Handle pagination
-        next_url = data["tracks"]["next"]
-        page_count = 1
-        while next_url:
-            print(f"[Spotify Import] Fetching page {page_count + 1}...")
-            resp = requests.get(next_url, headers=headers)
-            if resp.status_code != 200:
-                break
-            page = resp.json()
-            items.extend(page["items"])
-            next_url = page["next"]
-            page_count += 1
-
-        print(f"[Spotify Import] Total Spotify tracks: {len(items)}")
-
-        # Extract tracks
+        print(f"[Spotify Import] Initial items count: {len(data['tracks']['items'])}")
+
+        # Search YouTube Music concurrently; each search is a blocking network call.
+        # Searches are submitted as each Spotify page arrives, so they overlap
+        # with fetching the remaining pages.
         matched_count = 0
         failed_count = 0
-        for idx, item in enumerate(items):
-            track = item.get("track")
-            if not track or track.get("is_local"):
-                continue
-
-            name = track["name"]
-            artists = ", ".join([a["name"] for a in track["artists"]])
-            duration_sec = track["duration_ms"] // 1000
-
-            # Search YouTube Music via Piped
-            search_query = f"{artists} - {name}"
-            yt_result = search_youtube_music(search_query)
-
-            if yt_result:
-                tracks.append({
-                    "title": name,
-                    "artist": artists,
-                    "album": track["album"]["name"],
-                    "duration": duration_sec,
-                    "videoId": yt_result["videoId"],
-                    "thumbnail": yt_result["thumbnail"],
-                    "position": idx
-                })
-                matched_count += 1
-            else:
-                failed_count += 1
-            
-            # Log progress every 10 tracks
-            if (idx + 1) % 10 == 0:
-                print(f"[Spotify Import] Progress: {idx + 1}/{len(items)} tracks processed, {matched_count} matched, {failed_count} failed")
+        with ThreadPoolExecutor(max_workers=YT_SEARCH_WORKERS) as executor:
+            futures = {}  # future -> [(idx, track, artists), ...] resolved by that search
+            pending = {}  # normalized query -> future, so repeated tracks share one search
+            total_items = 0
+            queued = 0
+            for idx, item in enumerate(_iter_playlist_items(f"{api_url}/tracks", headers, data["tracks"])):
+                total_items += 1
+                track = item.get("track")
+                if not track or track.get("is_local"):
+                    continue
+                artists = ", ".join([a["name"] for a in track["artists"]])
+                search_query = f"{artists} - {track['name']}"
+                key = _normalize_query(search_query)
+                future = pending.get(key)
+                if future is None:
+                    future = executor.submit(search_youtube_music, search_query)
+                    pending[key] = future
+                    futures[future] = []
+                futures[future].append((idx, track, artists))
+                queued += 1
+
+            print(f"[Spotify Import] Total Spotify tracks: {total_items} ({len(futures)} distinct searches)")
+
+            done = 0
+            for future in as_completed(futures):
+                yt_result = future.result()
+                for idx, track, artists in futures[future]:
+                    done += 1
+                    if yt_result:
+                        tracks.append({
+                            "title": track["name"],
+                            "artist": artists,
+                            "album": track["album"]["name"],
+                            "duration": track["duration_ms"] // 1000,
+                            "videoId": yt_result["videoId"],
+                            "thumbnail": yt_result["thumbnail"],
+                            "position": idx
+                        })
+                        matched_count += 1
+                    else:
+                        failed_count += 1
+
+                    # Log progress every 10 tracks
+                    if done % 10 == 0:
+                        print(f"[Spotify Import] Progress: {done}/{queued} tracks processed, {matched_count} matched, {failed_count} failed")
+
+        # Searches complete out of order; restore playlist order
+        tracks.sort(key=lambda t: t["position"])
 
         print(f"[Spotify Import] Final: {matched_count} tracks matched, {failed_count} failed to find on YouTube")
 
-        return json.dumps({
+        return fast_json.dumps({
             "success": True,
             "title": playlist_name,
             "description": description,
             "thumbnail": thumbnail,
             "tracks": tracks
-        }, ensure_ascii=False)
+        })
 
     except Exception as e:
         print(f"[Spotify Import] Exception: {str(e)}")
-        return json.dumps({"success": False, "error": str(e)})
\ No newline at end of file
+        return fast_json.dumps({"success": False, "error": str(e)})
\ No newline at end of file
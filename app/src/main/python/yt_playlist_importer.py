@@ -4,14 +4,33 @@ This module provides playlist fetching functionality for YouTube and YouTube Mus
 """
 
 from ytmusicapi import YTMusic
-import json
 import logging
 import re
+import threading
+
+import fast_json
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Playlist ID from the list= query parameter
+_LIST_PARAM_RE = re.compile(r'list=([a-zA-Z0-9_-]+)')
+
+# Process-wide YTMusic client, created on first use and reused across imports
+_YT_CLIENT = None
+_YT_LOCK = threading.Lock()
+
+
+def _get_yt():
+    """Return the shared YTMusic client, constructing it once"""
+    global _YT_CLIENT
+    if _YT_CLIENT is None:
+        with _YT_LOCK:
+            if _YT_CLIENT is None:
+                _YT_CLIENT = YTMusic()
+    return _YT_CLIENT
+
 
 def extract_playlist_id(playlist_url):
     """
@@ -32,7 +51,7 @@ def extract_playlist_id(playlist_url):
         
         if "list=" in playlist_url:
             # Extract the list parameter
-            match = re.search(r'list=([a-zA-Z0-9_-]+)', playlist_url)
+            match = _LIST_PARAM_RE.search(playlist_url)
             if match:
                 return match.group(1)
         
@@ -42,6 +61,52 @@ def extract_playlist_id(playlist_url):
         return None
 
 
+def _parse_duration(track):
+    """
+    Track duration in seconds: duration_seconds if present, otherwise parsed
+    from the "3:45" / "1:02:03" duration string. None if neither is usable.
+    """
+    duration_val = track.get("duration_seconds")
+    if duration_val is not None:
+        return int(duration_val)
+
+    duration_str = track.get("duration", "")
+    if not duration_str:
+        return None
+    colons = duration_str.count(":")
+    if colons not in (1, 2):
+        return None
+    try:
+        parts = duration_str.split(":")
+        if colons == 1:
+            return int(parts[0]) * 60 + int(parts[1])
+        return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+    except ValueError:
+        return None
+
+
+def _to_track_info(idx, track):
+    """Convert one ytmusicapi playlist track to the dict sent to Kotlin"""
+    # Extract artist names
+    artist_name = ", ".join(a.get("name", "") for a in track.get("artists", []) if a.get("name"))
+
+    # Get track thumbnail
+    track_thumbnails = track.get("thumbnails", [])
+
+    # Get album info
+    album = track.get("album")
+
+    return {
+        "videoId": track.get("videoId", ""),
+        "title": track.get("title", "Unknown Title"),
+        "artist": artist_name or "Unknown Artist",
+        "album": album.get("name", "") if album else "",
+        "thumbnail": track_thumbnails[-1].get("url", "") if track_thumbnails else "",
+        "duration": _parse_duration(track),
+        "position": idx
+    }
+
+
 def fetch_playlist(playlist_url):
     """
     Fetch playlist data from YouTube/YouTube Music
@@ -57,21 +122,21 @@ def fetch_playlist(playlist_url):
         playlist_id = extract_playlist_id(playlist_url)
         
         if not playlist_id:
-            return json.dumps({
+            return fast_json.dumps({
                 "success": False,
                 "error": "Invalid YouTube playlist link. URL must contain 'list=' parameter."
             })
         
         logger.info(f"Fetching playlist: {playlist_id}")
         
-        # Initialize YTMusic client
-        yt = YTMusic()
+        # Shared YTMusic client (keeps its HTTP session alive between imports)
+        yt = _get_yt()
         
         # Fetch playlist data
         playlist_data = yt.get_playlist(playlist_id, limit=None)
         
         if not playlist_data:
-            return json.dumps({
+            return fast_json.dumps({
                 "success": False,
                 "error": "Could not fetch playlist. It may be private or deleted."
             })
@@ -84,68 +149,24 @@ def fetch_playlist(playlist_url):
         thumbnails = playlist_data.get("thumbnails", [])
         thumbnail_url = thumbnails[-1].get("url", "") if thumbnails else ""
         
-        # Process tracks
-        tracks = []
-        for idx, track in enumerate(playlist_data.get("tracks", [])):
-            # Skip unavailable tracks
-            if not track.get("videoId"):
-                continue
-                
-            # Extract artist names
-            artists = track.get("artists", [])
-            artist_name = ", ".join(a.get("name", "") for a in artists if a.get("name"))
-            if not artist_name:
-                artist_name = "Unknown Artist"
-            
-            # Get track thumbnail
-            track_thumbnails = track.get("thumbnails", [])
-            track_thumbnail = track_thumbnails[-1].get("url", "") if track_thumbnails else ""
-            
-            # Get album info
-            album = track.get("album")
-            album_name = album.get("name", "") if album else ""
-            
-            # Duration handling - can be None, string "3:45", or seconds integer
-            duration_seconds = None
-            duration_val = track.get("duration_seconds")
-            if duration_val is not None:
-                duration_seconds = int(duration_val)
-            else:
-                # Try parsing duration string
-                duration_str = track.get("duration", "")
-                if duration_str and ":" in duration_str:
-                    parts = duration_str.split(":")
-                    try:
-                        if len(parts) == 2:
-                            duration_seconds = int(parts[0]) * 60 + int(parts[1])
-                        elif len(parts) == 3:
-                            duration_seconds = int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-                    except ValueError:
-                        pass
-            
-            track_info = {
-                "videoId": track.get("videoId", ""),
-                "title": track.get("title", "Unknown Title"),
-                "artist": artist_name,
-                "album": album_name,
-                "thumbnail": track_thumbnail,
-                "duration": duration_seconds,
-                "position": idx
-            }
-            tracks.append(track_info)
+        # Process tracks, skipping unavailable ones (no videoId)
+        tracks = [
+            _to_track_info(idx, track)
+            for idx, track in enumerate(playlist_data.get("tracks", []))
+            if track.get("videoId")
+        ]
         
+        # Only the fields PlaylistRepository reads; the track count is len(tracks)
         result = {
             "success": True,
-            "playlistId": playlist_id,
             "title": title,
             "description": description,
             "thumbnail": thumbnail_url,
-            "trackCount": len(tracks),
             "tracks": tracks
         }
         
         logger.info(f"Successfully fetched playlist '{title}' with {len(tracks)} tracks")
-        return json.dumps(result)
+        return fast_json.dumps(result)
         
     except Exception as e:
         error_msg = str(e)
@@ -157,7 +178,7 @@ def fetch_playlist(playlist_url):
         elif "private" in error_msg.lower():
             error_msg = "This playlist is private. Only public playlists can be imported."
         
-        return json.dumps({
+        return fast_json.dumps({
             "success": False,
             "error": error_msg
         })
@@ -188,7 +209,7 @@ def validate_playlist_url(url):
         
         playlist_id = extract_playlist_id(url) if is_valid else None
         
-        return json.dumps({
+        return fast_json.dumps({
             "isValid": is_valid,
             "platform": platform,
             "playlistId": playlist_id
@@ -196,7 +217,7 @@ def validate_playlist_url(url):
         
     except Exception as e:
         logger.error(f"URL validation failed: {e}")
-        return json.dumps({
+        return fast_json.dumps({
             "isValid": False,
             "platform": None,
             "playlistId": None
@@ -3,14 +3,31 @@ YouTube Stream URL Extractor using yt-dlp
 Provides fallback streaming when NewPipeExtractor fails
 """
 import yt_dlp
-import json
 import sys
 import logging
+import threading
+import time
+import queue
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+
+import fast_json
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Extracted stream URLs are signed for ~6 hours; reuse them for 5
+STREAM_CACHE_TTL = 5 * 3600
+STREAM_CACHE_SIZE = 1024
+_STREAM_CACHE = OrderedDict()  # video_id -> (time extracted, result dict), oldest first
+_STREAM_CACHE_LOCK = threading.Lock()
+
+# At most this many YoutubeDL instances exist; extractions beyond that many
+# at once wait for one to be returned
+YTDL_POOL_SIZE = 3
+
 
 class YTDLPStreamExtractor:
     """Extracts stream URLs using yt-dlp as fallback when NewPipe fails"""
@@ -21,9 +38,37 @@ class YTDLPStreamExtractor:
             'quiet': True,
             'no_warnings': True,
             'extract_flat': False,
+            # Let yt-dlp pick the highest-bitrate audio format itself
             'format': 'bestaudio/best',
+            'format_sort': ['abr'],
             'noplaylist': True,
+            'skip_download': True,
+            # Audio formats come from the player response; skip manifest parsing
+            'youtube_include_dash_manifest': False,
+            'youtube_include_hls_manifest': False,
         }
+        # YoutubeDL isn't thread-safe, and building one per call reloads every
+        # extractor and the cookie jar. Extractions check an instance out of a
+        # small pool instead, so a few run in parallel while the number of
+        # instances stays capped however many IO threads call in.
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(YTDL_POOL_SIZE)
+
+    @contextmanager
+    def _checkout(self):
+        """
+        Borrow a YoutubeDL from the pool, creating one only when every
+        existing instance is in use and fewer than YTDL_POOL_SIZE exist
+        """
+        with self._slots:
+            try:
+                ydl = self._idle.get_nowait()
+            except queue.Empty:
+                ydl = yt_dlp.YoutubeDL(self.ytdl_opts)
+            try:
+                yield ydl
+            finally:
+                self._idle.put(ydl)
 
     def get_stream_url(self, video_id):
         """
@@ -35,38 +80,43 @@ class YTDLPStreamExtractor:
         Returns:
             dict: {'success': bool, 'url': str, 'error': str}
         """
+        with _STREAM_CACHE_LOCK:
+            cached = _STREAM_CACHE.get(video_id)
+            if cached is not None:
+                if time.time() - cached[0] < STREAM_CACHE_TTL:
+                    _STREAM_CACHE.move_to_end(video_id)
+                    return cached[1]
+                del _STREAM_CACHE[video_id]
+
         try:
             url = f"https://www.youtube.com/watch?v={video_id}"
 
-            with yt_dlp.YoutubeDL(self.ytdl_opts) as ydl:
-                # Extract info without downloading
+            # Extract info without downloading
+            with self._checkout() as ydl:
                 info = ydl.extract_info(url, download=False)
 
-                if info and 'formats' in info:
-                    # Get best audio format
-                    formats = info['formats']
-                    audio_formats = [f for f in formats if f.get('acodec') != 'none']
-
-                    if audio_formats:
-                        # Sort by bitrate (highest first)
-                        best_format = max(audio_formats,
-                                        key=lambda f: f.get('abr', 0) or f.get('tbr', 0) or 0)
-
-                        stream_url = best_format.get('url')
-                        if stream_url:
-                            logger.info(f"yt-dlp extracted stream URL for {video_id}")
-                            return {
-                                'success': True,
-                                'url': stream_url,
-                                'format': best_format.get('format_id', 'unknown'),
-                                'bitrate': best_format.get('abr', 0)
-                            }
-
-                return {
-                    'success': False,
-                    'url': None,
-                    'error': 'No audio formats found'
+            # The format selector has already chosen the best audio format
+            stream_url = info.get('url') if info else None
+            if stream_url:
+                logger.info(f"yt-dlp extracted stream URL for {video_id}")
+                result = {
+                    'success': True,
+                    'url': stream_url,
+                    'format': info.get('format_id', 'unknown'),
+                    'bitrate': info.get('abr', 0)
                 }
+                with _STREAM_CACHE_LOCK:
+                    _STREAM_CACHE[video_id] = (time.time(), result)
+                    _STREAM_CACHE.move_to_end(video_id)
+                    if len(_STREAM_CACHE) > STREAM_CACHE_SIZE:
+                        _STREAM_CACHE.popitem(last=False)
+                return result
+
+            return {
+                'success': False,
+                'url': None,
+                'error': 'No audio formats found'
+            }
 
         except Exception as e:
             logger.error(f"yt-dlp extraction failed for {video_id}: {str(e)}")
@@ -77,24 +127,54 @@ class YTDLPStreamExtractor:
             }
 
 
+def invalidate(video_id):
+    """
+    Drop a cached stream URL, e.g. after playback got a 403 on it,
+    so the next extract_stream_url call extracts a fresh one
+    """
+    with _STREAM_CACHE_LOCK:
+        _STREAM_CACHE.pop(video_id, None)
+
+
+@lru_cache(maxsize=1)
+def _get_extractor():
+    """Process-wide extractor shared by every extract_stream_url call"""
+    return YTDLPStreamExtractor()
+
+
 def extract_stream_url(video_id):
     """
     Main function to extract stream URL - called from Kotlin
     """
-    extractor = YTDLPStreamExtractor()
-    result = extractor.get_stream_url(video_id)
+    return _get_extractor().get_stream_url(video_id)
 
-    # Return JSON for Kotlin parsing
-    print(json.dumps(result))
-    return result
 
+def main():
+    """
+    Command-line entry point.
 
-if __name__ == "__main__":
+    With a video ID argument, prints one JSON result. Without one, reads
+    video IDs from stdin (one per line) and writes one JSON line per ID, so
+    a bulk pre-cache pass starts the interpreter and yt-dlp only once.
+    """
     if len(sys.argv) > 1:
-        video_id = sys.argv[1]
-        extract_stream_url(video_id)
-    else:
-        print(json.dumps({
+        print(fast_json.dumps(extract_stream_url(sys.argv[1])))
+        return
+
+    if sys.stdin.isatty():
+        print(fast_json.dumps({
             'success': False,
             'error': 'No video ID provided'
-        }))
\ No newline at end of file
+        }))
+        return
+
+    for line in sys.stdin:
+        video_id = line.strip()
+        if not video_id:
+            continue
+        sys.stdout.write(fast_json.dumps(extract_stream_url(video_id)) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,78 @@ This module provides song search and recommendation functionality using YouTube
 """
 
 from ytmusicapi import YTMusic
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import hashlib
+import inspect
 import logging
+import os
+import requests
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from sys import intern
+
+import fast_json
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Keep-alive session for the YTMusic client: pooled connections to
+# music.youtube.com, and a retry for connections dropped while idle
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+))
+
+
+# How many top search hits get_recommendations_for_query fetches radios for at once
+QUERY_CANDIDATES = 3
+
+# Queries whose top search hits are remembered, so a repeated
+# get_recommendations_for_query goes straight to the radio requests
+QUERY_CACHE_SIZE = 256
+
+# videoType values for audio tracks; music videos are filtered out of song results
+_AUDIO_VIDEO_TYPES = frozenset({'MUSIC_VIDEO_TYPE_ATV', 'MUSIC_VIDEO_TYPE_OFFICIAL_SOURCE_MUSIC'})
+
+
+@dataclass(slots=True)
+class Song:
+    """
+    One song/video row of a search or radio result. Slotted so large result
+    lists stay compact; fast_json serializes it with the same keys as the
+    dicts it replaced.
+    """
+    videoId: str
+    title: str
+    artist: str
+    album: str
+    duration: str
+    thumbnail: str
+    videoType: str
+
+
+def _thumbnail_url(thumbnails):
+    """URL of the last (largest) thumbnail, or '' if there are none"""
+    return thumbnails[-1].get('url', '') if thumbnails else ''
+
+
+def _artist_names(artists):
+    """
+    Comma-separated artist names, or '' if there are none. Interned, since
+    the same artist string repeats across most tracks of a result list.
+    """
+    return intern(', '.join([a['name'] for a in artists])) if artists else ''
+
 
 class YTMusicRecommender:
     """Handles YouTube Music API interactions for song recommendations"""
@@ -18,11 +83,35 @@ class YTMusicRecommender:
     def __init__(self):
         """Initialize YTMusic client"""
         try:
-            self.yt = YTMusic()
+            self.yt = YTMusic(requests_session=_SESSION)
             logger.info("YTMusic client initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize YTMusic: {e}")
             self.yt = None
+        
+        # query -> top QUERY_CANDIDATES songs of its search, in LRU order
+        self._query_candidates = OrderedDict()
+        self._query_lock = threading.Lock()
+    
+    def _candidates_for_query(self, query):
+        """
+        Top QUERY_CANDIDATES song hits for a query, from the query cache when
+        it was searched recently, otherwise from a fresh search_songs call
+        """
+        with self._query_lock:
+            candidates = self._query_candidates.get(query)
+            if candidates is not None:
+                self._query_candidates.move_to_end(query)
+                return candidates
+        
+        candidates = self.search_songs(query, limit=5)[:QUERY_CANDIDATES]
+        if candidates:
+            with self._query_lock:
+                self._query_candidates[query] = candidates
+                self._query_candidates.move_to_end(query)
+                while len(self._query_candidates) > QUERY_CACHE_SIZE:
+                    self._query_candidates.popitem(last=False)
+        return candidates
     
     def search_songs(self, query, limit=20):
         """
@@ -33,7 +122,7 @@ class YTMusicRecommender:
             limit: Maximum number of results (default 20)
             
         Returns:
-            List of song dictionaries with keys: videoId, title, artist, album, duration, thumbnail
+            List of Song records (videoId, title, artist, album, duration, thumbnail, videoType)
         """
         if not self.yt:
             logger.error("YTMusic client not initialized")
@@ -44,19 +133,22 @@ class YTMusicRecommender:
             songs = []
             
             for item in results:
-                song = {
-                    'videoId': item.get('videoId', ''),
-                    'title': item.get('title', 'Unknown Title'),
-                    'artist': ', '.join([a['name'] for a in item.get('artists', [])]) or 'Unknown Artist',
-                    'album': item.get('album', {}).get('name', 'Unknown Album') if item.get('album') else 'Unknown Album',
-                    'duration': item.get('duration', '0:00'),
-                    'thumbnail': item.get('thumbnails', [{}])[-1].get('url', '') if item.get('thumbnails') else '',
-                    'videoType': item.get('videoType', 'MUSIC_VIDEO_TYPE_ATV')
-                }
-                
                 # Only include audio tracks (songs), not music videos
-                if song['videoType'] in ['MUSIC_VIDEO_TYPE_ATV', 'MUSIC_VIDEO_TYPE_OFFICIAL_SOURCE_MUSIC']:
-                    songs.append(song)
+                video_type = item.get('videoType', 'MUSIC_VIDEO_TYPE_ATV')
+                if video_type not in _AUDIO_VIDEO_TYPES:
+                    continue
+                video_type = intern(video_type)
+
+                album = item.get('album')
+                songs.append(Song(
+                    videoId=item.get('videoId', ''),
+                    title=item.get('title', 'Unknown Title'),
+                    artist=_artist_names(item.get('artists')) or 'Unknown Artist',
+                    album=album.get('name', 'Unknown Album') if album else 'Unknown Album',
+                    duration=item.get('duration', '0:00'),
+                    thumbnail=_thumbnail_url(item.get('thumbnails')),
+                    videoType=video_type
+                ))
             
             logger.info(f"Found {len(songs)} songs for query: {query}")
             return songs
@@ -82,18 +174,17 @@ class YTMusicRecommender:
         
         try:
             results = self.yt.search(query, filter='albums', limit=limit)
-            albums = []
-            
-            for item in results:
-                album = {
+            albums = [
+                {
                     'browseId': item.get('browseId', ''),
                     'title': item.get('title', 'Unknown Album'),
-                    'artist': ', '.join([a['name'] for a in item.get('artists', [])]) or 'Unknown Artist',
+                    'artist': _artist_names(item.get('artists')) or 'Unknown Artist',
                     'year': item.get('year', ''),
-                    'thumbnail': item.get('thumbnails', [{}])[-1].get('url', '') if item.get('thumbnails') else '',
+                    'thumbnail': _thumbnail_url(item.get('thumbnails')),
                     'type': item.get('resultType', 'album')
                 }
-                albums.append(album)
+                for item in results
+            ]
             
             logger.info(f"Found {len(albums)} albums for query: {query}")
             return albums
@@ -119,18 +210,17 @@ class YTMusicRecommender:
         
         try:
             results = self.yt.search(query, filter='videos', limit=limit)
-            videos = []
-            
-            for item in results:
-                video = {
+            videos = [
+                {
                     'videoId': item.get('videoId', ''),
                     'title': item.get('title', 'Unknown Title'),
-                    'artist': ', '.join([a['name'] for a in item.get('artists', [])]) or 'Unknown Artist',
+                    'artist': _artist_names(item.get('artists')) or 'Unknown Artist',
                     'duration': item.get('duration', '0:00'),
-                    'thumbnail': item.get('thumbnails', [{}])[-1].get('url', '') if item.get('thumbnails') else '',
+                    'thumbnail': _thumbnail_url(item.get('thumbnails')),
                     'views': item.get('views', '')
                 }
-                videos.append(video)
+                for item in results
+            ]
             
             logger.info(f"Found {len(videos)} videos for query: {query}")
             return videos
@@ -161,16 +251,16 @@ class YTMusicRecommender:
                 logger.warning(f"No artists found for query: {query}")
                 return []
             
-            artists = []
-            for item in results:
-                artist = {
+            artists = [
+                {
                     'browseId': item.get('browseId', ''),
                     'name': item.get('artist', 'Unknown Artist'),
-                    'thumbnail': item.get('thumbnails', [{}])[-1].get('url', '') if item.get('thumbnails') else '',
+                    'thumbnail': _thumbnail_url(item.get('thumbnails')),
                     'type': item.get('resultType', 'artist'),
                     'subscribers': item.get('subscribers', '')
                 }
-                artists.append(artist)
+                for item in results
+            ]
             
             logger.info(f"Found {len(artists)} artists for query: {query}")
             return artists
@@ -200,24 +290,27 @@ class YTMusicRecommender:
                 logger.warning(f"No album details found for browseId: {browse_id}")
                 return None
             
-            songs = []
-            for track in album.get('tracks', []):
-                song = {
+            # Shared by every track row
+            album_title = album.get('title', 'Unknown Album')
+            
+            songs = [
+                {
                     'videoId': track.get('videoId', ''),
                     'title': track.get('title', 'Unknown Title'),
-                    'artist': ', '.join([a['name'] for a in track.get('artists', [])]) or 'Unknown Artist',
-                    'album': album.get('title', 'Unknown Album'),
+                    'artist': _artist_names(track.get('artists')) or 'Unknown Artist',
+                    'album': album_title,
                     'duration': str(track.get('duration', '0:00')),
-                    'thumbnail': track.get('thumbnails', [{}])[-1].get('url', '') if track.get('thumbnails') else ''
+                    'thumbnail': _thumbnail_url(track.get('thumbnails'))
                 }
-                songs.append(song)
+                for track in album.get('tracks') or ()
+            ]
             
             result = {
                 'browseId': browse_id,
-                'title': album.get('title', 'Unknown Album'),
-                'artist': ', '.join([a['name'] for a in album.get('artists', [])]) or 'Unknown Artist',
+                'title': album_title,
+                'artist': _artist_names(album.get('artists')) or 'Unknown Artist',
                 'year': str(album.get('year', '')),
-                'thumbnail': album.get('thumbnails', [{}])[-1].get('url', '') if album.get('thumbnails') else '',
+                'thumbnail': _thumbnail_url(album.get('thumbnails')),
                 'trackCount': album.get('trackCount', len(songs)),
                 'duration': album.get('duration', ''),
                 'description': album.get('description', ''),
@@ -253,6 +346,9 @@ class YTMusicRecommender:
                 logger.warning(f"No artist details found for browseId: {browse_id}")
                 return None
             
+            # Fallback artist for tracks without their own artists list
+            artist_name = artist.get('name', 'Unknown Artist')
+            
             songs = []
             songs_browse_id = None
             has_more_songs = False
@@ -269,22 +365,23 @@ class YTMusicRecommender:
                 if 'results' in songs_data:
                     results = songs_data['results']
                     total_songs_available = len(results)
-                    for track in results[:limit]:
-                        song = {
+                    songs = [
+                        {
                             'videoId': track.get('videoId', ''),
                             'title': track.get('title', 'Unknown Title'),
-                            'artist': ', '.join([a['name'] for a in track.get('artists', [])]) or artist.get('name', 'Unknown Artist'),
-                            'album': track.get('album', {}).get('name', '') if track.get('album') else '',
+                            'artist': _artist_names(track.get('artists')) or artist_name,
+                            'album': track['album'].get('name', '') if track.get('album') else '',
                             'duration': str(track.get('duration', '0:00')),
-                            'thumbnail': track.get('thumbnails', [{}])[-1].get('url', '') if track.get('thumbnails') else ''
+                            'thumbnail': _thumbnail_url(track.get('thumbnails'))
                         }
-                        songs.append(song)
+                        for track in results[:limit]
+                    ]
             
             result = {
                 'browseId': browse_id,
-                'name': artist.get('name', 'Unknown Artist'),
+                'name': artist_name,
                 'description': artist.get('description', ''),
-                'thumbnail': artist.get('thumbnails', [{}])[-1].get('url', '') if artist.get('thumbnails') else '',
+                'thumbnail': _thumbnail_url(artist.get('thumbnails')),
                 'subscribers': artist.get('subscribers', ''),
                 'songs': songs,
                 'songsBrowseId': songs_browse_id,
@@ -322,17 +419,17 @@ class YTMusicRecommender:
                 logger.warning(f"No songs found for songs browseId: {songs_browse_id}")
                 return []
             
-            songs = []
-            for track in playlist['tracks']:
-                song = {
+            songs = [
+                {
                     'videoId': track.get('videoId', ''),
                     'title': track.get('title', 'Unknown Title'),
-                    'artist': ', '.join([a['name'] for a in track.get('artists', [])]) or 'Unknown Artist',
-                    'album': track.get('album', {}).get('name', '') if track.get('album') else '',
+                    'artist': _artist_names(track.get('artists')) or 'Unknown Artist',
+                    'album': track['album'].get('name', '') if track.get('album') else '',
                     'duration': str(track.get('duration', '0:00')),
-                    'thumbnail': track.get('thumbnails', [{}])[-1].get('url', '') if track.get('thumbnails') else ''
+                    'thumbnail': _thumbnail_url(track.get('thumbnails'))
                 }
-                songs.append(song)
+                for track in playlist['tracks']
+            ]
             
             logger.info(f"Retrieved {len(songs)} songs from artist songs playlist")
             return songs
@@ -351,7 +448,7 @@ class YTMusicRecommender:
             limit: Maximum number of recommendations (default 25)
             
         Returns:
-            List of recommended song dictionaries
+            List of recommended Song records
         """
         if not self.yt:
             logger.error("YTMusic client not initialized")
@@ -369,19 +466,22 @@ class YTMusicRecommender:
             recommendations = []
             
             for track in tracks:
-                song = {
-                    'videoId': track.get('videoId', ''),
-                    'title': track.get('title', 'Unknown Title'),
-                    'artist': ', '.join([a['name'] for a in track.get('artists', [])]) or 'Unknown Artist',
-                    'album': track.get('album', {}).get('name', 'Unknown Album') if track.get('album') else 'Unknown Album',
-                    'duration': str(track.get('length', '0:00')),
-                    'thumbnail': track.get('thumbnail', [{}])[-1].get('url', '') if track.get('thumbnail') else '',
-                    'videoType': track.get('videoType', 'MUSIC_VIDEO_TYPE_ATV')
-                }
-                
                 # Filter: Only include audio tracks (songs), exclude music videos
-                if song['videoType'] in ['MUSIC_VIDEO_TYPE_ATV', 'MUSIC_VIDEO_TYPE_OFFICIAL_SOURCE_MUSIC']:
-                    recommendations.append(song)
+                video_type = track.get('videoType', 'MUSIC_VIDEO_TYPE_ATV')
+                if video_type not in _AUDIO_VIDEO_TYPES:
+                    continue
+                video_type = intern(video_type)
+
+                album = track.get('album')
+                recommendations.append(Song(
+                    videoId=track.get('videoId', ''),
+                    title=track.get('title', 'Unknown Title'),
+                    artist=_artist_names(track.get('artists')) or 'Unknown Artist',
+                    album=album.get('name', 'Unknown Album') if album else 'Unknown Album',
+                    duration=str(track.get('length', '0:00')),
+                    thumbnail=_thumbnail_url(track.get('thumbnail')),
+                    videoType=video_type
+                ))
             
             logger.info(f"Found {len(recommendations)}/{len(tracks)} song recommendations for video_id: {video_id}")
             return recommendations
@@ -400,7 +500,7 @@ class YTMusicRecommender:
             limit: Maximum number of recommendations (default 25)
             
         Returns:
-            List of recommended song/video dictionaries
+            List of recommended Song records (songs and videos)
         """
         if not self.yt:
             logger.error("YTMusic client not initialized")
@@ -418,17 +518,18 @@ class YTMusicRecommender:
             recommendations = []
             
             for track in tracks:
-                item = {
-                    'videoId': track.get('videoId', ''),
-                    'title': track.get('title', 'Unknown Title'),
-                    'artist': ', '.join([a['name'] for a in track.get('artists', [])]) or 'Unknown Artist',
-                    'album': track.get('album', {}).get('name', 'Unknown Album') if track.get('album') else 'Unknown Album',
-                    'duration': str(track.get('length', '0:00')),
-                    'thumbnail': track.get('thumbnail', [{}])[-1].get('url', '') if track.get('thumbnail') else '',
-                    'videoType': track.get('videoType', 'MUSIC_VIDEO_TYPE_ATV')
-                }
+                album = track.get('album')
+                video_type = track.get('videoType', 'MUSIC_VIDEO_TYPE_ATV')
                 # Include all types - no filtering
-                recommendations.append(item)
+                recommendations.append(Song(
+                    videoId=track.get('videoId', ''),
+                    title=track.get('title', 'Unknown Title'),
+                    artist=_artist_names(track.get('artists')) or 'Unknown Artist',
+                    album=album.get('name', 'Unknown Album') if album else 'Unknown Album',
+                    duration=str(track.get('length', '0:00')),
+                    thumbnail=_thumbnail_url(track.get('thumbnail')),
+                    videoType=intern(video_type) if isinstance(video_type, str) else video_type
+                ))
             
             logger.info(f"Found {len(recommendations)} all-type recommendations for video_id: {video_id}")
             return recommendations
@@ -440,33 +541,58 @@ class YTMusicRecommender:
     def get_recommendations_for_query(self, query, limit=25):
         """
         Get song recommendations based on a search query
-        First searches for songs, then gets recommendations based on the first result
+        First searches for songs (skipped when the query's top hits are
+        cached), then fetches recommendations for the top result; only if
+        that is empty are the other QUERY_CANDIDATES results fetched
+        concurrently, returning the highest-ranked non-empty list
         
         Args:
             query: Search query string
             limit: Maximum number of recommendations (default 25)
             
         Returns:
-            List of recommended song dictionaries
+            List of recommended Song records
         """
         if not self.yt:
             logger.error("YTMusic client not initialized")
             return []
         
         try:
-            # First, search for songs matching the query
-            search_results = self.search_songs(query, limit=5)
+            # First, find songs matching the query
+            candidates = self._candidates_for_query(query)
             
-            if not search_results:
+            if not candidates:
                 logger.warning(f"No songs found for query: {query}")
                 return []
             
-            # Use the first song to get recommendations
-            first_song_id = search_results[0]['videoId']
-            logger.info(f"Using song '{search_results[0]['title']}' (ID: {first_song_id}) for recommendations")
-            
-            recommendations = self.get_song_recommendations(first_song_id, limit)
-            return recommendations
+            # The top hit almost always has a radio, so fetch it alone; the
+            # other candidates are only fanned out to when it comes back empty
+            first = candidates[0]
+            recommendations = self.get_song_recommendations(first.videoId, limit)
+            if recommendations:
+                logger.info(f"Using song '{first.title}' (ID: {first.videoId}) for recommendations")
+                return recommendations
+            
+            fallbacks = candidates[1:]
+            if fallbacks:
+                executor = ThreadPoolExecutor(max_workers=len(fallbacks))
+                try:
+                    futures = [
+                        executor.submit(self.get_song_recommendations, song.videoId, limit)
+                        for song in fallbacks
+                    ]
+                    # Prefer the best-ranked remaining hit
+                    for song, future in zip(fallbacks, futures):
+                        recommendations = future.result()
+                        if recommendations:
+                            logger.info(f"Using song '{song.title}' (ID: {song.videoId}) for recommendations")
+                            return recommendations
+                finally:
+                    # Don't hold the caller on lower-ranked radios once one is chosen
+                    executor.shutdown(wait=False, cancel_futures=True)
+            
+            logger.warning(f"No recommendations for any of the top results for query: {query}")
+            return []
             
         except Exception as e:
             logger.error(f"Failed to get recommendations for query '{query}': {e}")
@@ -500,19 +626,19 @@ class YTMusicRecommender:
                 entry = {
                     'resultType': result_type,
                     'title': item.get('title', 'Unknown Title'),
-                    'thumbnail': item.get('thumbnails', [{}])[-1].get('url', '') if item.get('thumbnails') else ''
+                    'thumbnail': _thumbnail_url(item.get('thumbnails'))
                 }
                 
                 # Extract type-specific fields
                 if result_type in ['song', 'video']:
                     entry['videoId'] = item.get('videoId', '')
-                    entry['artist'] = ', '.join([a['name'] for a in item.get('artists', [])]) or 'Unknown Artist'
+                    entry['artist'] = _artist_names(item.get('artists')) or 'Unknown Artist'
                     entry['album'] = item.get('album', {}).get('name', '') if item.get('album') else ''
                     entry['duration'] = item.get('duration', '0:00')
                     
                 elif result_type == 'album':
                     entry['browseId'] = item.get('browseId', '')
-                    entry['artist'] = ', '.join([a['name'] for a in item.get('artists', [])]) or 'Unknown Artist'
+                    entry['artist'] = _artist_names(item.get('artists')) or 'Unknown Artist'
                     entry['year'] = item.get('year', '')
                     
                 elif result_type == 'artist':
@@ -526,7 +652,7 @@ class YTMusicRecommender:
                     if result_type == 'episode':
                         entry['videoId'] = item.get('videoId', '')
                     
-                    entry['artist'] = ', '.join([a['name'] for a in item.get('artists', [])]) if 'artists' in item else item.get('author', 'Unknown Author')
+                    entry['artist'] = _artist_names(item.get('artists')) if 'artists' in item else item.get('author', 'Unknown Author')
                     entry['duration'] = item.get('duration', '')
                 
                 items.append(entry)
@@ -538,191 +664,320 @@ class YTMusicRecommender:
             logger.error(f"Mixed search failed for query '{query}': {e}")
             return []
 
+# Result cache for the module-level functions: the serialized JSON is kept
+# in memory (LRU) and in a small sqlite table under $HOME, so repeated
+# queries skip both the YouTube Music round-trip and re-serialization.
+# Empty results ("[]" / "null") are not cached since they include failures.
+
+SEARCH_CACHE_TTL = 24 * 3600  # searches
+# Radio/recommendation feeds change from visit to visit; only reuse them briefly
+RECOMMENDATIONS_CACHE_TTL = 10 * 60
+DETAILS_CACHE_TTL = 7 * 24 * 3600  # album/artist pages
+MEMORY_CACHE_SIZE = 512
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".synctax_cache", "ytm.sqlite")
+
+_memory_cache = OrderedDict()  # key -> (expires, json string), least recent first
+_cache_lock = threading.Lock()
+_cache_db = None
+_cache_db_failed = False
+
+
+def _get_cache_db():
+    """Open (once) the sqlite cache; None if it can't be used"""
+    global _cache_db, _cache_db_failed
+    if _cache_db is None and not _cache_db_failed:
+        try:
+            os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+            db = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+            db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires REAL, value BLOB)")
+            db.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+            db.commit()
+            _cache_db = db
+        except Exception as e:
+            logger.warning(f"Result cache disabled, could not open {CACHE_PATH}: {e}")
+            _cache_db_failed = True
+    return _cache_db
+
+
+def _cache_get(key):
+    now = time.time()
+    with _cache_lock:
+        entry = _memory_cache.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                _memory_cache.move_to_end(key)
+                return entry[1]
+            del _memory_cache[key]
+
+        db = _get_cache_db()
+        if db is None:
+            return None
+        try:
+            row = db.execute("SELECT expires, value FROM cache WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache read failed: {e}")
+            return None
+        if row is None or row[0] <= now:
+            return None
+        value = row[1].decode("utf-8")
+        _memory_put(key, row[0], value)
+        return value
+
+
+def _memory_put(key, expires, value):
+    _memory_cache[key] = (expires, value)
+    _memory_cache.move_to_end(key)
+    if len(_memory_cache) > MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+
+def _cache_put(key, value, ttl):
+    expires = time.time() + ttl
+    with _cache_lock:
+        _memory_put(key, expires, value)
+        db = _get_cache_db()
+        if db is None:
+            return
+        try:
+            db.execute("INSERT OR REPLACE INTO cache (key, expires, value) VALUES (?, ?, ?)",
+                       (key, expires, value.encode("utf-8")))
+            db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache write failed: {e}")
+
+
+def _cached_json(ttl):
+    """
+    Cache a module-level function's JSON string result by (name, arguments).
+    Arguments are bound to the signature with defaults applied, so f(q),
+    f(q, 20) and f(q, limit=20) share one entry.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            raw_key = f"{fn.__name__}|{sorted(bound.arguments.items())!r}"
+            key = hashlib.blake2b(raw_key.encode("utf-8"), digest_size=16).hexdigest()
+            cached = _cache_get(key)
+            if cached is not None:
+                return cached
+            result = fn(*args, **kwargs)
+            if result not in ("[]", "null"):
+                _cache_put(key, result, ttl)
+            return result
+        return wrapper
+    return decorator
+
+
 # Module-level functions for easy calling from Kotlin via Chaquopy
 
 _recommender = None
+_recommender_lock = threading.Lock()
+
+
+def _ensure_recommender():
+    """Create the shared recommender on first use; concurrent callers wait for the first"""
+    global _recommender
+    if _recommender is None:
+        with _recommender_lock:
+            if _recommender is None:
+                _recommender = YTMusicRecommender()
+    return _recommender
 
 
 def initialize():
-    """Initialize the YTMusic recommender"""
+    """
+    (Re)initialize the YTMusic recommender
+    Called from Kotlin at app startup, off the main thread, to warm up the
+    client; calling it again replaces the client with a fresh one
+    """
     global _recommender
     try:
-        _recommender = YTMusicRecommender()
+        # Build under the lock so wrappers arriving meanwhile wait for this
+        # client instead of creating their own
+        with _recommender_lock:
+            _recommender = YTMusicRecommender()
         return "YTMusic initialized successfully"
     except Exception as e:
         logger.error(f"Initialization failed: {e}")
         return f"Initialization failed: {e}"
 
 
+@_cached_json(SEARCH_CACHE_TTL)
 def search_all(query, limit=20):
     """
     Mixed search for all types
     Returns JSON string of mixed list
     """
-    global _recommender
-    if not _recommender:
-        initialize()
+    _ensure_recommender()
     
     try:
         results = _recommender.search_all(query, limit)
-        return json.dumps(results)
+        return fast_json.dumps(results)
     except Exception as e:
         logger.error(f"search_all error: {e}")
-        return json.dumps([])
+        return fast_json.dumps([])
 
 
+@_cached_json(SEARCH_CACHE_TTL)
 def search_songs(query, limit=20):
     """
     Search for songs
     Returns JSON string of song list
     """
-    global _recommender
-    if not _recommender:
-        initialize()
+    _ensure_recommender()
     
     try:
         songs = _recommender.search_songs(query, limit)
-        return json.dumps(songs)
+        return fast_json.dumps(songs)
     except Exception as e:
         logger.error(f"search_songs error: {e}")
-        return json.dumps([])
+        return fast_json.dumps([])
 
 
+@_cached_json(SEARCH_CACHE_TTL)
 def search_albums(query, limit=20):
     """
     Search for albums
     Returns JSON string of album list
     """
-    global _recommender
-    if not _recommender:
-        initialize()
+    _ensure_recommender()
     
     try:
         albums = _recommender.search_albums(query, limit)
-        return json.dumps(albums)
+        return fast_json.dumps(albums)
     except Exception as e:
         logger.error(f"search_albums error: {e}")
-        return json.dumps([])
+        return fast_json.dumps([])
 
 
+@_cached_json(SEARCH_CACHE_TTL)
 def search_artists(query, limit=10):
     """
     Search for artists
     Returns JSON string of artist list
     """
-    global _recommender
-    if not _recommender:
-        initialize()
+    _ensure_recommender()
     
     try:
         artists = _recommender.search_artists(query, limit)
-        return json.dumps(artists)
+        return fast_json.dumps(artists)
     except Exception as e:
         logger.error(f"search_artists error: {e}")
-        return json.dumps([])
+        return fast_json.dumps([])
 
 
+@_cached_json(RECOMMENDATIONS_CACHE_TTL)
 def get_song_recommendations(video_id, limit=25):
     """
     Get recommendations for a specific video ID
     Returns JSON string of recommendation list
     """
-    global _recommender
-    if not _recommender:
-        initialize()
+    _ensure_recommender()
     
     try:
         recommendations = _recommender.get_song_recommendations(video_id, limit)
-        return json.dumps(recommendations)
+        return fast_json.dumps(recommendations)
     except Exception as e:
         logger.error(f"get_song_recommendations error: {e}")
-        return json.dumps([])
+        return fast_json.dumps([])
 
 
+@_cached_json(RECOMMENDATIONS_CACHE_TTL)
 def get_all_recommendations(video_id, limit=25):
     """
     Get all recommendations (songs + videos) for a specific video ID
     Does not filter by video type, useful for music videos
     Returns JSON string of recommendation list
     """
-    global _recommender
-    if not _recommender:
-        initialize()
+    _ensure_recommender()
     
     try:
         recommendations = _recommender.get_all_recommendations(video_id, limit)
-        return json.dumps(recommendations)
+        return fast_json.dumps(recommendations)
     except Exception as e:
         logger.error(f"get_all_recommendations error: {e}")
-        return json.dumps([])
+        return fast_json.dumps([])
 
 
+@_cached_json(RECOMMENDATIONS_CACHE_TTL)
 def get_recommendations_for_query(query, limit=25):
     """
     Get recommendations based on a search query
     Returns JSON string of recommendation list
     """
-    global _recommender
-    if not _recommender:
-        initialize()
+    _ensure_recommender()
     
     try:
         recommendations = _recommender.get_recommendations_for_query(query, limit)
-        return json.dumps(recommendations)
+        return fast_json.dumps(recommendations)
     except Exception as e:
         logger.error(f"get_recommendations_for_query error: {e}")
-        return json.dumps([])
+        return fast_json.dumps([])
+
+
+async def get_recommendations_for_query_async(query, limit=25):
+    """
+    Awaitable get_recommendations_for_query, run on a worker thread so
+    several queries can be overlapped with asyncio.gather
+    """
+    return await asyncio.to_thread(get_recommendations_for_query, query, limit)
+
 
+async def get_song_recommendations_async(video_id, limit=25):
+    """Awaitable get_song_recommendations, run on a worker thread"""
+    return await asyncio.to_thread(get_song_recommendations, video_id, limit)
 
+
+@_cached_json(DETAILS_CACHE_TTL)
 def get_album_details(browse_id):
     """
     Get album details including songs list
     Returns JSON string of album details with songs
     """
-    global _recommender
-    if not _recommender:
-        initialize()
+    _ensure_recommender()
     
     try:
         album = _recommender.get_album_details(browse_id)
-        return json.dumps(album) if album else json.dumps(None)
+        return fast_json.dumps(album) if album else fast_json.dumps(None)
     except Exception as e:
         logger.error(f"get_album_details error: {e}")
-        return json.dumps(None)
+        return fast_json.dumps(None)
 
 
+@_cached_json(DETAILS_CACHE_TTL)
 def get_artist_details(browse_id):
     """
     Get artist details including top songs
     Returns JSON string of artist details with songs
     """
-    global _recommender
-    if not _recommender:
-        initialize()
+    _ensure_recommender()
     
     try:
         artist = _recommender.get_artist_details(browse_id)
-        return json.dumps(artist) if artist else json.dumps(None)
+        return fast_json.dumps(artist) if artist else fast_json.dumps(None)
     except Exception as e:
         logger.error(f"get_artist_details error: {e}")
-        return json.dumps(None)
+        return fast_json.dumps(None)
 
 
+@_cached_json(DETAILS_CACHE_TTL)
 def get_artist_all_songs(songs_browse_id, limit=100):
     """
     Get all songs from an artist using the songs browseId
     Returns JSON string of songs list
     """
-    global _recommender
-    if not _recommender:
-        initialize()
+    _ensure_recommender()
     
     try:
         songs = _recommender.get_artist_all_songs(songs_browse_id, limit)
-        return json.dumps(songs) if songs else json.dumps([])
+        return fast_json.dumps(songs) if songs else fast_json.dumps([])
     except Exception as e:
         logger.error(f"get_artist_all_songs error: {e}")
-        return json.dumps([])
+        return fast_json.dumps([])
 
 
 def get_search_suggestions(query):
@@ -730,21 +985,19 @@ def get_search_suggestions(query):
     Get search suggestions for the given query
     Returns JSON string of suggestions list
     """
-    global _recommender
-    if not _recommender:
-        initialize()
+    _ensure_recommender()
     
     try:
         if not _recommender.yt:
             logger.error("YTMusic client not initialized")
-            return json.dumps([])
+            return fast_json.dumps([])
         
         suggestions = _recommender.yt.get_search_suggestions(query)
         # The API returns a list of suggestion strings
         result = suggestions if suggestions else []
         logger.info(f"Got {len(result)} suggestions for query: {query}")
-        return json.dumps(result)
+        return fast_json.dumps(result)
     except Exception as e:
         logger.error(f"get_search_suggestions error: {e}")
-        return json.dumps([])
+        return fast_json.dumps([])
 
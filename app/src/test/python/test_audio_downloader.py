@@ -0,0 +1,94 @@
+"""
+Tests for audio_downloader.download_audio_batch. Run with
+    python -m pytest app/src/test/python
+YoutubeDL is replaced by a fake that writes a small file instead of
+downloading, and FFmpeg is reported as present so no local tool is probed.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+import yt_dlp
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "main", "python"))
+
+import audio_downloader
+
+
+class _FakeYoutubeDL:
+    """Records every instance; URLs containing 'android-fails' fail on that client"""
+
+    instances = []
+
+    def __init__(self, opts):
+        self.opts = opts
+        self.client = opts["extractor_args"]["youtube"]["player_client"][0]
+        self.urls = []
+        self.closed = False
+        _FakeYoutubeDL.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.closed = True
+
+    def extract_info(self, url, download=True):
+        self.urls.append(url)
+        if self.client == "android" and "android-fails" in url:
+            raise RuntimeError("android client refused")
+        title = url.rsplit("=", 1)[-1]
+        path = os.path.join(os.path.dirname(self.opts["outtmpl"]), f"{title}.m4a")
+        with open(path, "wb") as f:
+            f.write(b"audio")
+        return {"title": title, "ext": "m4a", "uploader": "U", "duration": 3}
+
+    def prepare_filename(self, info):
+        return os.path.join(os.path.dirname(self.opts["outtmpl"]), f"{info['title']}.{info['ext']}")
+
+
+@pytest.fixture(autouse=True)
+def fake_youtube_dl(monkeypatch):
+    monkeypatch.setattr(yt_dlp, "YoutubeDL", _FakeYoutubeDL)
+    monkeypatch.setattr(_FakeYoutubeDL, "instances", [])
+    monkeypatch.setattr(audio_downloader, "_find_ffmpeg", lambda: "ffmpeg")
+
+
+URLS = [
+    "https://www.youtube.com/watch?v=one",
+    "https://www.youtube.com/watch?v=two-android-fails",
+    "https://www.youtube.com/watch?v=three",
+]
+
+
+@pytest.mark.parametrize("urls", [URLS, json.dumps(URLS)], ids=["list", "json"])
+def test_batch_results_follow_url_order(tmp_path, urls):
+    results = json.loads(audio_downloader.download_audio_batch(urls, str(tmp_path)))
+
+    assert [r["title"] for r in results] == ["one", "two-android-fails", "three"]
+    assert all(r["success"] for r in results)
+    assert [r["client_used"] for r in results] == ["android", "web", "android"]
+    assert [os.path.basename(r["file_path"]) for r in results] == ["one.m4a", "two-android-fails.m4a", "three.m4a"]
+
+
+def test_batch_reuses_one_youtubedl_per_client(tmp_path):
+    audio_downloader.download_audio_batch(URLS, str(tmp_path))
+
+    by_client = {ydl.client: ydl for ydl in _FakeYoutubeDL.instances}
+    assert len(_FakeYoutubeDL.instances) == len(by_client) == 2
+    assert by_client["android"].urls == URLS
+    assert by_client["web"].urls == [URLS[1]]
+    assert all(ydl.closed for ydl in _FakeYoutubeDL.instances)
+
+
+def test_single_download_closes_its_youtubedl(tmp_path):
+    result = json.loads(audio_downloader.download_audio(URLS[0], str(tmp_path)))
+
+    assert result["success"]
+    assert len(_FakeYoutubeDL.instances) == 1
+    assert _FakeYoutubeDL.instances[0].closed
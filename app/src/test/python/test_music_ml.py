@@ -0,0 +1,67 @@
+"""
+Tests for music_ml's nearest-centroid lookup. Run with
+    python -m pytest app/src/test/python
+Every test runs against both the NumPy kernels (the on-device path, since
+Chaquopy has no numba) and the numba kernels when numba is installed.
+"""
+
+import importlib
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "main", "python"))
+
+
+@pytest.fixture(params=["numpy", "numba"])
+def music_ml(request, monkeypatch):
+    if request.param == "numpy":
+        monkeypatch.setitem(sys.modules, "numba", None)
+    elif importlib.util.find_spec("numba") is None:
+        pytest.skip("numba not installed")
+    monkeypatch.delitem(sys.modules, "music_ml", raising=False)
+    module = importlib.import_module("music_ml")
+    assert module.HAS_NUMBA == (request.param == "numba")
+    return module
+
+
+def _clustering(music_ml, centroids):
+    clustering = music_ml.SimpleClustering(n_clusters=len(centroids))
+    clustering._set_centroids(centroids)
+    return clustering
+
+
+# Three 6-wide centroids, far apart in the first feature
+CENTROIDS = [
+    [0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+    [5.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+    [10.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+]
+
+
+def test_wider_song_uses_shared_features(music_ml):
+    clustering = _clustering(music_ml, CENTROIDS)
+    # Features past the centroid width are ignored, like the old zip()-based distance
+    song = [9.0, 0.0, 0.0, 0.0, 0.0, 0.0, 100.0, -100.0]
+    assert clustering.predict_cluster(song) == 2
+    assert clustering.predict_cluster_batch(np.array([song, [4.5] + [0.0] * 7])).tolist() == [2, 1]
+
+
+def test_narrower_song_uses_shared_features(music_ml):
+    clustering = _clustering(music_ml, CENTROIDS)
+    assert clustering.predict_cluster([0.4, 0.0, 0.0]) == 0
+    assert clustering.predict_cluster_batch(np.array([[5.2, 0.0], [11.0, 0.0]])).tolist() == [1, 2]
+
+
+def test_recommend_with_mismatched_width(music_ml, tmp_path):
+    engine = music_ml.MusicRecommendationML(model_dir=str(tmp_path))
+    rng = np.random.default_rng(0)
+    history = {"features": rng.random((20, 6)).tolist()}
+    assert engine.train(json.dumps(history))["success"]
+
+    result = engine.recommend(json.dumps(rng.random(8).tolist()))
+    assert result["message"] == "Recommendation generated successfully"
+    assert 0 <= result["cluster"] < engine.clustering.n_clusters
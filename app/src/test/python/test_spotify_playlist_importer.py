@@ -0,0 +1,72 @@
+"""
+Tests for spotify_playlist_importer's YouTube Music search breaker. Run with
+    python -m pytest app/src/test/python
+No request leaves the process: searches go to a fake YTMusic client and
+HTTP sends are intercepted below the session's adapter.
+"""
+
+import os
+import sys
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "main", "python"))
+
+import spotify_playlist_importer as importer
+
+
+class _FailingYTMusic:
+    """Stands in for YTMusic; every search raises the given exception"""
+
+    def __init__(self, error):
+        self.error = error
+        self.searches = []
+
+    def search(self, query, filter=None, limit=None):
+        self.searches.append(query)
+        raise self.error
+
+
+@pytest.fixture(autouse=True)
+def fresh_search_state(monkeypatch):
+    monkeypatch.setattr(importer, "_search_hits", type(importer._search_hits)())
+    monkeypatch.setattr(importer, "_search_misses", {})
+    importer._reset_search_breaker()
+    yield
+    importer._reset_search_breaker()
+
+
+@pytest.mark.parametrize("error", [
+    requests.exceptions.ReadTimeout("read timed out"),
+    importer.YTMusicServerError("Server returned HTTP 503: Service Unavailable."),
+])
+def test_breaker_skips_remaining_tracks(monkeypatch, error):
+    ytmusic = _FailingYTMusic(error)
+    monkeypatch.setattr(importer, "_ytmusic", ytmusic)
+
+    results = [importer.search_youtube_music(f"Artist {i} - Track {i}") for i in range(20)]
+
+    assert results == [None] * 20
+    assert len(ytmusic.searches) == importer.SEARCH_FAILURE_THRESHOLD
+
+
+def test_session_applies_default_timeout(monkeypatch):
+    sent = {}
+
+    def fake_send(self, request, **kwargs):
+        sent["timeout"] = kwargs.get("timeout")
+        response = requests.Response()
+        response.status_code = 200
+        response.request = request
+        response.url = request.url
+        return response
+
+    monkeypatch.setattr(HTTPAdapter, "send", fake_send)
+
+    importer._SESSION.post("https://music.youtube.com/youtubei/v1/search", json={})
+    assert sent["timeout"] == importer.HTTP_TIMEOUT
+
+    importer._SESSION.get("https://api.spotify.com/v1/playlists/x", timeout=20)
+    assert sent["timeout"] == 20
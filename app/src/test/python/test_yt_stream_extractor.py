@@ -0,0 +1,66 @@
+"""
+Tests for yt_stream_extractor's YoutubeDL pool. Run with
+    python -m pytest app/src/test/python
+YoutubeDL is replaced by a fake, so nothing is extracted over the network.
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "main", "python"))
+
+import yt_stream_extractor
+
+
+class _FakeYoutubeDL:
+    """Counts instances and the most extractions running at once"""
+
+    lock = threading.Lock()
+    created = 0
+    active = 0
+    max_active = 0
+
+    def __init__(self, opts):
+        with _FakeYoutubeDL.lock:
+            _FakeYoutubeDL.created += 1
+
+    def extract_info(self, url, download=False):
+        with _FakeYoutubeDL.lock:
+            _FakeYoutubeDL.active += 1
+            _FakeYoutubeDL.max_active = max(_FakeYoutubeDL.max_active, _FakeYoutubeDL.active)
+        time.sleep(0.05)
+        with _FakeYoutubeDL.lock:
+            _FakeYoutubeDL.active -= 1
+        return {"url": f"https://stream/{url[-3:]}", "format_id": "251", "abr": 160}
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    monkeypatch.setattr(yt_stream_extractor.yt_dlp, "YoutubeDL", _FakeYoutubeDL)
+    monkeypatch.setattr(_FakeYoutubeDL, "created", 0)
+    monkeypatch.setattr(_FakeYoutubeDL, "max_active", 0)
+    yt_stream_extractor._STREAM_CACHE.clear()
+    yield yt_stream_extractor.YTDLPStreamExtractor()
+    yt_stream_extractor._STREAM_CACHE.clear()
+
+
+def test_pool_caps_youtubedl_instances(extractor):
+    video_ids = [f"v{i:02d}" for i in range(16)]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(extractor.get_stream_url, video_ids))
+
+    assert [r["url"] for r in results] == [f"https://stream/{v}" for v in video_ids]
+    assert _FakeYoutubeDL.created <= yt_stream_extractor.YTDL_POOL_SIZE
+    assert 1 < _FakeYoutubeDL.max_active <= yt_stream_extractor.YTDL_POOL_SIZE
+
+
+def test_cached_url_skips_extraction(extractor):
+    first = extractor.get_stream_url("abc")
+    created = _FakeYoutubeDL.created
+    assert extractor.get_stream_url("abc") is first
+    assert _FakeYoutubeDL.created == created
@@ -0,0 +1,78 @@
+"""
+Tests for ytmusic_recommender's result cache. Run with
+    python -m pytest app/src/test/python
+The sqlite cache is pointed at a temporary directory and the YTMusic client
+is replaced by a fake, so nothing touches $HOME or the network.
+"""
+
+import os
+import sys
+import time
+from collections import OrderedDict
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "main", "python"))
+
+import ytmusic_recommender
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(ytmusic_recommender, "CACHE_PATH", str(tmp_path / "ytm.sqlite"))
+    monkeypatch.setattr(ytmusic_recommender, "_cache_db", None)
+    monkeypatch.setattr(ytmusic_recommender, "_cache_db_failed", False)
+    monkeypatch.setattr(ytmusic_recommender, "_memory_cache", OrderedDict())
+
+
+class _FakeRecommender:
+    def __init__(self):
+        self.calls = []
+
+    def search_songs(self, query, limit):
+        self.calls.append(("search_songs", query, limit))
+        return [{"videoId": "v1", "title": query}]
+
+    def get_all_recommendations(self, video_id, limit):
+        self.calls.append(("get_all_recommendations", video_id, limit))
+        return [{"videoId": "v2", "title": "next"}]
+
+
+@pytest.fixture
+def recommender(monkeypatch):
+    fake = _FakeRecommender()
+    monkeypatch.setattr(ytmusic_recommender, "_recommender", fake)
+    return fake
+
+
+def test_equivalent_calls_share_one_entry(recommender):
+    results = {
+        ytmusic_recommender.search_songs("lofi"),
+        ytmusic_recommender.search_songs("lofi", 20),
+        ytmusic_recommender.search_songs("lofi", limit=20),
+        ytmusic_recommender.search_songs(query="lofi", limit=20),
+    }
+
+    assert len(results) == 1
+    assert recommender.calls == [("search_songs", "lofi", 20)]
+    assert len(ytmusic_recommender._memory_cache) == 1
+
+
+def test_different_limit_is_a_different_entry(recommender):
+    ytmusic_recommender.search_songs("lofi")
+    ytmusic_recommender.search_songs("lofi", limit=5)
+
+    assert recommender.calls == [("search_songs", "lofi", 20), ("search_songs", "lofi", 5)]
+
+
+def test_recommendations_expire_sooner_than_searches(recommender):
+    now = time.time()
+    ytmusic_recommender.search_songs("lofi")
+    ytmusic_recommender.get_all_recommendations("v1")
+
+    search_expires, recommendations_expires = (
+        expires for expires, _ in ytmusic_recommender._memory_cache.values()
+    )
+    assert search_expires >= now + ytmusic_recommender.SEARCH_CACHE_TTL
+    assert recommendations_expires < now + ytmusic_recommender.RECOMMENDATIONS_CACHE_TTL + 60
+    assert ytmusic_recommender.RECOMMENDATIONS_CACHE_TTL < ytmusic_recommender.SEARCH_CACHE_TTL